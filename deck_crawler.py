@@ -23,14 +23,36 @@ python deck_crawler_dual.py --deck-code Ab1C --ua "Mozilla/5.0" -o deck.json
 """
 
 import argparse
+import asyncio
+import functools
 import json
+import string
 import sys
-from typing import Any, Dict, Optional, Tuple
-from urllib.request import urlopen, Request
-from urllib.error import URLError, HTTPError
+from collections import namedtuple
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
 from urllib.parse import urlparse, parse_qsl, urlencode, urlunparse
 
+import requests
+from requests.adapters import HTTPAdapter
+
+try:
+    import orjson
+except ImportError:  # 未安裝時退回標準函式庫 json
+    orjson = None
+
+try:
+    import aiohttp
+except ImportError:  # 僅批次非同步擷取（scrape_many）需要
+    aiohttp = None
+
 GET_DECK_ENDPOINT = "https://shadowverse-wb.com/web/DeckCode/getDeck"
+# 已是 API 樣式的網址前綴，可直接略過解析
+DECK_HASH_DETAIL_PREFIX = "https://shadowverse-wb.com/web/DeckBuilder/deckHashDetail?"
+
+# 共用連線池：批次擷取時沿用 keep-alive 連線，避免每次請求重做 TCP/TLS 握手
+_SESSION = requests.Session()
+_SESSION.headers.update({"User-Agent": "Mozilla/5.0"})
+_SESSION.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=16))
 
 # 需要輸出的欄位
 NEEDED_FIELDS = [
@@ -49,63 +71,84 @@ NEEDED_FIELDS = [
 # 常見包裹層鍵名
 CANDIDATE_ROOT_KEYS = ["data", "result", "deckDetail", "deck", "payload"]
 
-def _first_non_none(*vals):
-    for v in vals:
-        if v is not None:
-            return v
-    return None
-
-def _dig(obj: Dict[str, Any], key: str) -> Optional[Any]:
-    """在可能的容器層中找 key；若頂層沒有，就往常見 root key 裡找一次。"""
-    if key in obj:
-        return obj[key]
-    for rk in CANDIDATE_ROOT_KEYS:
-        sub = obj.get(rk)
-        if isinstance(sub, dict) and key in sub:
-            return sub[key]
-    return None
+# 欄位與缺值時的預設值；容器型預設值以工廠函式表示，避免各次呼叫共用同一個物件
+DECK_FIELD_DEFAULTS = (
+    ("total_red_ether", 0),
+    ("num_follower", 0),
+    ("num_spell", 0),
+    ("num_amulet", 0),
+    ("mana_curve", dict),
+    ("battle_format", 2),
+    ("class_id", 5),
+    ("sub_class_id", None),
+    ("sort_card_id_list", list),
+    ("deck_card_num", dict),
+)
 
 def format_deck_data(raw: Dict[str, Any]) -> Dict[str, Any]:
     """將原始 JSON 對齊成需要的欄位，缺值給預設。"""
-    return {
-        "total_red_ether": _first_non_none(_dig(raw, "total_red_ether"), 0),
-        "num_follower":    _first_non_none(_dig(raw, "num_follower"), 0),
-        "num_spell":       _first_non_none(_dig(raw, "num_spell"), 0),
-        "num_amulet":      _first_non_none(_dig(raw, "num_amulet"), 0),
-        "mana_curve":      _first_non_none(_dig(raw, "mana_curve"), {}),
-        "battle_format":   _first_non_none(_dig(raw, "battle_format"), 2),
-        "class_id":        _first_non_none(_dig(raw, "class_id"), 5),
-        "sub_class_id":    _first_non_none(_dig(raw, "sub_class_id"), None),
-        "sort_card_id_list": _first_non_none(_dig(raw, "sort_card_id_list"), []),
-        "deck_card_num":   _first_non_none(_dig(raw, "deck_card_num"), {}),
-    }
+    # 可能的容器層只找一次：頂層優先，其次是常見 root key 底下的物件
+    containers = [raw]
+    for rk in CANDIDATE_ROOT_KEYS:
+        sub = raw.get(rk)
+        if isinstance(sub, dict):
+            containers.append(sub)
+
+    deck = {}
+    for key, default in DECK_FIELD_DEFAULTS:
+        value = None
+        for container in containers:
+            if key in container:
+                value = container[key]
+                break
+        if value is None:
+            value = default() if callable(default) else default
+        deck[key] = value
+    return deck
 
 def _decode_json_bytes(data: bytes) -> Dict[str, Any]:
-    try:
-        text = data.decode("utf-8", errors="strict")
-    except UnicodeDecodeError:
-        text = data.decode("latin-1", errors="replace")
-    try:
-        obj = json.loads(text)
-    except json.JSONDecodeError as e:
-        raise RuntimeError(f"內容不是合法 JSON：{e}") from e
+    obj = None
+    if orjson is not None:
+        # orjson 直接吃 bytes，省去先 decode 成 str 的一趟；失敗（如非 UTF-8）再走標準路徑
+        try:
+            obj = orjson.loads(data)
+        except orjson.JSONDecodeError:
+            obj = None
+    if obj is None:
+        try:
+            text = data.decode("utf-8", errors="strict")
+        except UnicodeDecodeError:
+            text = data.decode("latin-1", errors="replace")
+        try:
+            obj = json.loads(text)
+        except json.JSONDecodeError as e:
+            raise RuntimeError(f"內容不是合法 JSON：{e}") from e
     if not isinstance(obj, dict):
         raise RuntimeError("最外層 JSON 不是物件（dict），不符合預期")
     return obj
 
+def format_deck_data_many(raw_bodies: Iterable[bytes]) -> List[Dict[str, Any]]:
+    """批次版本：將多份原始回應內容（bytes，例如快取下來的 API 回應）解碼並對齊欄位。"""
+    return [format_deck_data(_decode_json_bytes(body)) for body in raw_bodies]
+
+def _dump_json(obj: Any) -> str:
+    """輸出排版過的 JSON 字串（保留非 ASCII 字元）。"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS).decode("utf-8")
+    return json.dumps(obj, ensure_ascii=False, indent=2)
+
 def fetch_json_via_url(url: str, user_agent: Optional[str] = None) -> Dict[str, Any]:
     headers = {}
     if user_agent:
         headers["User-Agent"] = user_agent
-    req = Request(url, headers=headers)
     try:
-        with urlopen(req, timeout=30) as resp:
-            data = resp.read()
-    except HTTPError as e:
-        raise RuntimeError(f"HTTP {e.code} - {e.reason}") from e
-    except URLError as e:
-        raise RuntimeError(f"URL 錯誤：{e.reason}") from e
-    return _decode_json_bytes(data)
+        resp = _SESSION.get(url, headers=headers, timeout=30)
+        resp.raise_for_status()
+    except requests.HTTPError as e:
+        raise RuntimeError(f"HTTP {e.response.status_code} - {e.response.reason}") from e
+    except requests.RequestException as e:
+        raise RuntimeError(f"URL 錯誤：{e}") from e
+    return _decode_json_bytes(resp.content)
 
 def fetch_json_via_deck_code(deck_code: str, user_agent: Optional[str] = None) -> Dict[str, Any]:
     """POST 到官方 getDeck 端點，payload: {\"deck_code\": \"XXXX\"}"""
@@ -113,42 +156,55 @@ def fetch_json_via_deck_code(deck_code: str, user_agent: Optional[str] = None) -
     if user_agent:
         headers["User-Agent"] = user_agent
     body = json.dumps({"deck_code": deck_code}).encode("utf-8")
-    req = Request(GET_DECK_ENDPOINT, headers=headers, data=body, method="POST")
     try:
-        with urlopen(req, timeout=30) as resp:
-            data = resp.read()
-    except HTTPError as e:
+        resp = _SESSION.post(GET_DECK_ENDPOINT, headers=headers, data=body, timeout=30)
+        resp.raise_for_status()
+    except requests.HTTPError as e:
         # 盡量帶出伺服器回覆
-        detail = ""
-        try:
-            detail = e.read().decode("utf-8", errors="ignore")
-        except Exception:
-            pass
-        msg = f"HTTP {e.code} - {e.reason}"
+        msg = f"HTTP {e.response.status_code} - {e.response.reason}"
+        detail = e.response.content.decode("utf-8", errors="ignore")
         if detail:
             msg += f" - {detail}"
         raise RuntimeError(msg) from e
-    except URLError as e:
-        raise RuntimeError(f"URL 錯誤：{e.reason}") from e
-    return _decode_json_bytes(data)
+    except requests.RequestException as e:
+        raise RuntimeError(f"URL 錯誤：{e}") from e
+    return _decode_json_bytes(resp.content)
 
-def normalize_deck_url_if_needed(raw_url: str) -> Tuple[str, Optional[str]]:
+# 解析後的網址；query 已展開成 dict，方便就地修改後再組回字串
+_ParsedURL = namedtuple("_ParsedURL", "scheme netloc path params query_dict fragment")
+
+def _parse_url(url: str) -> _ParsedURL:
+    u = urlparse(url)
+    return _ParsedURL(u.scheme, u.netloc, u.path, u.params,
+                      dict(parse_qsl(u.query, keep_blank_values=True)), u.fragment)
+
+# urlencode（quote_plus）不會轉義的字元
+_URL_SAFE_CHARS = frozenset(string.ascii_letters + string.digits + "_.-~")
+
+def _unparse_url(p: _ParsedURL) -> str:
+    # 常見情況（無 params/fragment、query 只含安全字元）直接組字串，結果與 urlencode + urlunparse 相同
+    if (p.scheme and p.netloc and p.path.startswith("/") and not p.params and not p.fragment
+            and all(_URL_SAFE_CHARS.issuperset(k) and _URL_SAFE_CHARS.issuperset(v)
+                    for k, v in p.query_dict.items())):
+        query = "&".join(f"{k}={v}" for k, v in p.query_dict.items())
+        base = f"{p.scheme}://{p.netloc}{p.path}"
+        return f"{base}?{query}" if query else base
+    return urlunparse((p.scheme, p.netloc, p.path, p.params, urlencode(p.query_dict), p.fragment))
+
+def _normalize_parsed(u: _ParsedURL) -> Tuple[Optional[_ParsedURL], Optional[str]]:
     """
-    若為舊樣式 https://shadowverse-wb.com/<lang>/deck/detail/?hash=... ，
-    轉為 https://shadowverse-wb.com/web/DeckBuilder/deckHashDetail?hash=... ，
-    並回傳偵測到的 lang（若有）。
-    回傳: (normalized_url, detected_lang or None)
+    對已解析的網址做舊樣式轉換。
+    回傳: (轉換後的 _ParsedURL，不需轉換時為 None, detected_lang or None)
     """
-    u = urlparse(raw_url)
     path = (u.path or "").lower()
     host = (u.netloc or "").lower()
 
     # 只處理 shadowverse-wb.com domain
     if not host.endswith("shadowverse-wb.com"):
-        return raw_url, None
+        return None, None
 
-    # 解析 query 以取得 hash
-    q = dict(parse_qsl(u.query, keep_blank_values=True))
+    # 從 query 取得 hash
+    q = u.query_dict
     hash_val = q.get("hash")
 
     # path segments（去掉空片段）
@@ -176,20 +232,59 @@ def normalize_deck_url_if_needed(raw_url: str) -> Tuple[str, Optional[str]]:
             new_query_pairs["lang"] = q["lang"]
         elif detected_lang:
             new_query_pairs["lang"] = detected_lang
-        new_u = urlunparse((u.scheme or "https", u.netloc, new_path, "", urlencode(new_query_pairs), ""))
-        return new_u, detected_lang
+        return _ParsedURL(u.scheme or "https", u.netloc, new_path, "", new_query_pairs, ""), detected_lang
 
     # 否則不變
-    return raw_url, None
+    return None, None
 
+@functools.lru_cache(maxsize=4096)
+def normalize_deck_url_if_needed(raw_url: str) -> Tuple[str, Optional[str]]:
+    """
+    若為舊樣式 https://shadowverse-wb.com/<lang>/deck/detail/?hash=... ，
+    轉為 https://shadowverse-wb.com/web/DeckBuilder/deckHashDetail?hash=... ，
+    並回傳偵測到的 lang（若有）。
+    回傳: (normalized_url, detected_lang or None)
+    """
+    # 快速路徑：已是 API 樣式就不必解析
+    if raw_url.startswith(DECK_HASH_DETAIL_PREFIX):
+        return raw_url, None
+
+    normalized, detected_lang = _normalize_parsed(_parse_url(raw_url))
+    if normalized is None:
+        return raw_url, None
+    return _unparse_url(normalized), detected_lang
+
+@functools.lru_cache(maxsize=4096)
 def add_or_update_lang_query(url: str, lang: Optional[str]) -> str:
     if not lang:
         return url
-    u = urlparse(url)
-    q = dict(parse_qsl(u.query, keep_blank_values=True))
-    q["lang"] = lang
-    new_query = urlencode(q)
-    return urlunparse((u.scheme, u.netloc, u.path, u.params, new_query, u.fragment))
+    # 快速路徑：query 內唯一的 lang 已是目標值（且無 fragment）就不必重組網址
+    query = url.partition("?")[2]
+    if "#" not in query and [p for p in query.split("&") if p.startswith("lang=")] == [f"lang={lang}"]:
+        return url
+    u = _parse_url(url)
+    u.query_dict["lang"] = lang
+    return _unparse_url(u)
+
+@functools.lru_cache(maxsize=4096)
+def build_deck_fetch_url(raw_url: str, lang: Optional[str] = None) -> str:
+    """
+    等同 add_or_update_lang_query(*normalize_deck_url_if_needed(raw_url)) 並以 lang 覆蓋偵測到的語言，
+    但整個過程只解析、組回網址各一次。
+    """
+    if raw_url.startswith(DECK_HASH_DETAIL_PREFIX):
+        return add_or_update_lang_query(raw_url, lang)
+
+    u = _parse_url(raw_url)
+    normalized, detected_lang = _normalize_parsed(u)
+    if normalized is None:
+        if not lang:
+            return raw_url
+        normalized = u
+    lang = lang or detected_lang
+    if lang:
+        normalized.query_dict["lang"] = lang
+    return _unparse_url(normalized)
 
 def scrape_deck_by_url(url: str, user_agent: Optional[str] = None) -> Dict[str, Any]:
     raw = fetch_json_via_url(url, user_agent=user_agent)
@@ -199,6 +294,67 @@ def scrape_deck_by_code(deck_code: str, user_agent: Optional[str] = None) -> Dic
     raw = fetch_json_via_deck_code(deck_code, user_agent=user_agent)
     return format_deck_data(raw)
 
+async def fetch_json_via_url_async(url: str, session: "aiohttp.ClientSession") -> Dict[str, Any]:
+    """fetch_json_via_url 的非同步版本，共用呼叫端傳入的 ClientSession 連線池。"""
+    try:
+        async with session.get(url) as resp:
+            resp.raise_for_status()
+            data = await resp.read()
+    except aiohttp.ClientResponseError as e:
+        raise RuntimeError(f"HTTP {e.status} - {e.message}") from e
+    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+        raise RuntimeError(f"URL 錯誤：{e}") from e
+    return _decode_json_bytes(data)
+
+async def fetch_json_via_deck_code_async(deck_code: str, session: "aiohttp.ClientSession") -> Dict[str, Any]:
+    """fetch_json_via_deck_code 的非同步版本。"""
+    headers = {"Content-Type": "application/json; charset=utf-8"}
+    body = json.dumps({"deck_code": deck_code}).encode("utf-8")
+    try:
+        async with session.post(GET_DECK_ENDPOINT, headers=headers, data=body) as resp:
+            if resp.status >= 400:
+                # 盡量帶出伺服器回覆
+                msg = f"HTTP {resp.status} - {resp.reason}"
+                detail = (await resp.read()).decode("utf-8", errors="ignore")
+                if detail:
+                    msg += f" - {detail}"
+                raise RuntimeError(msg)
+            data = await resp.read()
+    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+        raise RuntimeError(f"URL 錯誤：{e}") from e
+    return _decode_json_bytes(data)
+
+async def scrape_many_async(urls_or_codes: Iterable[str], user_agent: Optional[str] = "Mozilla/5.0",
+                            limit: int = 32) -> List[Union[Dict[str, Any], Exception]]:
+    """
+    以單一 aiohttp.ClientSession 同時擷取多副牌組。
+    以 http(s):// 開頭者視為 URL（會先做舊樣式轉換），其餘視為 Deck Code。
+    回傳順序與輸入相同；個別失敗的項目以例外物件放在對應位置，不影響其他項目。
+    """
+    if aiohttp is None:
+        raise RuntimeError("批次擷取需要 aiohttp，請先執行: pip install aiohttp")
+
+    async def _scrape_one(item: str, session: "aiohttp.ClientSession") -> Dict[str, Any]:
+        item = item.strip()
+        if item.lower().startswith(("http://", "https://")):
+            fetch_url = build_deck_fetch_url(item)
+            raw = await fetch_json_via_url_async(fetch_url, session)
+        else:
+            raw = await fetch_json_via_deck_code_async(item, session)
+        return format_deck_data(raw)
+
+    headers = {"User-Agent": user_agent} if user_agent else None
+    timeout = aiohttp.ClientTimeout(total=30)
+    connector = aiohttp.TCPConnector(limit=limit)
+    async with aiohttp.ClientSession(headers=headers, timeout=timeout, connector=connector) as session:
+        return await asyncio.gather(*(_scrape_one(item, session) for item in urls_or_codes),
+                                    return_exceptions=True)
+
+def scrape_many(urls_or_codes: Iterable[str], user_agent: Optional[str] = "Mozilla/5.0",
+                limit: int = 32) -> List[Union[Dict[str, Any], Exception]]:
+    """scrape_many_async 的同步包裝。"""
+    return asyncio.run(scrape_many_async(urls_or_codes, user_agent=user_agent, limit=limit))
+
 def main():
     parser = argparse.ArgumentParser(description="Shadowverse 牌組資訊（URL / Deck Code 雙模式，含 URL 前處理）")
     g = parser.add_mutually_exclusive_group(required=True)
@@ -212,10 +368,8 @@ def main():
 
     try:
         if args.url:
-            # 先做舊樣式轉換（可偵測到 path 的語言）
-            normalized_url, detected_lang = normalize_deck_url_if_needed(args.url)
-            # 再以 --lang 覆蓋（若提供）
-            fetch_url = add_or_update_lang_query(normalized_url, args.lang or detected_lang)
+            # 舊樣式轉換（可偵測到 path 的語言），再以 --lang 覆蓋（若提供）
+            fetch_url = build_deck_fetch_url(args.url, args.lang)
             deck = scrape_deck_by_url(fetch_url, user_agent=args.ua)
         else:
             deck_code = args.deck_code.strip()
@@ -226,9 +380,9 @@ def main():
 
     if args.output:
         with open(args.output, "w", encoding="utf-8") as f:
-            json.dump(deck, f, ensure_ascii=False, indent=2)
+            f.write(_dump_json(deck))
     else:
-        print(json.dumps(deck, ensure_ascii=False, indent=2))
+        print(_dump_json(deck))
 
 if __name__ == "__main__":
     main()
@@ -4,8 +4,66 @@
 Shadowverse 爬蟲使用範例
 """
 
+import asyncio
+import os
+
+try:
+    import aiohttp
+except ImportError:  # 僅非同步範例（自訂爬蟲、語言比較）需要
+    aiohttp = None
+
+try:
+    import requests_cache
+except ImportError:  # 僅開發時的回應快取（SV_EXAMPLE_CACHE）需要
+    requests_cache = None
+
+try:
+    from aiohttp_client_cache import CachedSession, SQLiteBackend
+except ImportError:  # 僅開發時快取 aiohttp 回應（SV_EXAMPLE_CACHE）需要
+    CachedSession = SQLiteBackend = None
+
+# aiohttp 回應快取的有效秒數；None 表示未啟用
+_aiohttp_cache_expire = None
+
 from shadowverse_simple_crawler import ShadowverseSimpleCrawler, crawl_single_language
 
+def enable_http_cache(expire_after: int = 3600) -> bool:
+    """開發用：設定環境變數 SV_EXAMPLE_CACHE=1 時，將爬蟲的回應快取到磁碟，重複執行範例不必再打 API
+    
+    同步 requests 使用 requests-cache，aiohttp 範例使用 aiohttp-client-cache，兩者皆為選用套件；
+    Firebase/Supabase 查詢範例用於示範對已同步資料的即時查詢，不做快取
+    """
+    global _aiohttp_cache_expire
+    
+    if not os.environ.get('SV_EXAMPLE_CACHE'):
+        return False
+    
+    os.makedirs('output', exist_ok=True)
+    enabled = False
+    
+    if requests_cache is None:
+        print("未安裝 requests-cache，略過 requests 回應快取: pip install requests-cache")
+    else:
+        requests_cache.install_cache('output/http_cache', expire_after=expire_after)
+        enabled = True
+    
+    if CachedSession is None:
+        print("未安裝 aiohttp-client-cache，略過 aiohttp 回應快取: pip install aiohttp-client-cache")
+    else:
+        _aiohttp_cache_expire = expire_after
+        enabled = True
+    
+    if enabled:
+        print(f"已啟用 HTTP 回應快取（{expire_after} 秒）")
+    return enabled
+
+def client_session(connector):
+    """建立 aiohttp 連線；啟用回應快取時改用 aiohttp-client-cache 的 CachedSession"""
+    if _aiohttp_cache_expire is not None:
+        cache = SQLiteBackend('output/aiohttp_cache', expire_after=_aiohttp_cache_expire)
+        return CachedSession(cache=cache, connector=connector)
+    return aiohttp.ClientSession(connector=connector)
+
 def example_single_language():
     """範例：爬取單一語言"""
     print("=== 範例：爬取繁體中文卡牌資料 ===")
@@ -16,18 +74,36 @@ def example_single_language():
     print(f"爬取完成，共 {data['data']['count']} 張卡片")
     print("檔案已儲存為: output/shadowverse_cards_cht.json")
 
+async def gather_fetches(requests):
+    """以共用的連線池同時獲取多組 (crawler, offset) 的資料（回傳順序與 requests 相同）"""
+    connector = aiohttp.TCPConnector(limit=10)
+    async with client_session(connector) as session:
+        return await asyncio.gather(*(crawler.fetch_card_data_async(session, offset) for crawler, offset in requests))
+
+async def fetch_offsets(crawler, offsets):
+    """同時獲取單一爬蟲多個 offset 的資料（回傳順序與 offsets 相同）"""
+    return await gather_fetches([(crawler, offset) for offset in offsets])
+
+async def fetch_first_batches(crawlers):
+    """同時獲取各爬蟲的第一批資料（回傳順序與 crawlers 相同）"""
+    return await gather_fetches([(crawler, 0) for crawler in crawlers])
+
 def example_custom_crawler():
     """範例：自訂爬蟲設定"""
     print("\n=== 範例：自訂爬蟲設定 ===")
     
+    if aiohttp is None:
+        print("未安裝 aiohttp，略過此範例: pip install aiohttp")
+        return
+    
     # 建立英文版爬蟲
     crawler = ShadowverseSimpleCrawler('en')
     
     # 只獲取前 60 張卡片（前兩批）
     print("獲取前兩批資料...")
     
-    for offset in [0, 30]:
-        data = crawler.fetch_card_data(offset)
+    # 兩批請求同時送出，完成後再依序合併
+    for data in asyncio.run(fetch_offsets(crawler, [0, 30])):
         if data:
             crawler.merge_data(data)
     
@@ -41,13 +117,18 @@ def example_compare_languages():
     """範例：比較不同語言的卡片名稱"""
     print("\n=== 範例：比較不同語言的卡片名稱 ===")
     
+    if aiohttp is None:
+        print("未安裝 aiohttp，略過此範例: pip install aiohttp")
+        return
+    
     languages = ['cht', 'en']
     card_names = {}
     
-    for lang in languages:
-        crawler = ShadowverseSimpleCrawler(lang)
-        data = crawler.fetch_card_data(0)  # 只獲取第一批
-        
+    # 各語言只獲取第一批，所有語言的請求同時送出
+    crawlers = [ShadowverseSimpleCrawler(lang) for lang in languages]
+    results = asyncio.run(fetch_first_batches(crawlers))
+    
+    for lang, data in zip(languages, results):
         if data and 'data' in data:
             card_details = data['data'].get('card_details', {})
             if card_details:
@@ -68,6 +149,8 @@ def main():
     print("Shadowverse 爬蟲使用範例")
     print("=" * 40)
     
+    enable_http_cache()
+    
     # 範例 1：爬取單一語言
     example_single_language()
     
@@ -5,11 +5,19 @@ Firebase Firestore 查詢範例
 展示如何查詢已同步的卡牌資料
 """
 
+import functools
 import json
 import os
 import sys
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Any
 
+try:
+    import orjson
+except ImportError:  # 未安裝時退回標準函式庫 json
+    orjson = None
+
 try:
     import firebase_admin
     from firebase_admin import credentials, firestore
@@ -17,21 +25,27 @@ except ImportError:
     print("請先安裝 Firebase Admin SDK: pip install firebase-admin")
     sys.exit(1)
 
+@functools.lru_cache(maxsize=1)
 def load_config():
-    """載入 Firebase 配置"""
+    """載入 Firebase 配置 (同一次執行只讀取一次)"""
     config_file = 'firebase/config.json'
     
     if os.path.exists(config_file):
-        with open(config_file, 'r', encoding='utf-8') as f:
-            config_data = json.load(f)
+        if orjson is not None:
+            with open(config_file, 'rb') as f:
+                config_data = orjson.loads(f.read())
+        else:
+            with open(config_file, 'r', encoding='utf-8') as f:
+                config_data = json.load(f)
         return config_data
     else:
         print("找不到配置檔案: firebase/config.json")
         print("請先執行 python firebase/init_firebase.py config")
         return None
 
+@functools.lru_cache(maxsize=1)
 def initialize_firebase():
-    """初始化 Firebase"""
+    """初始化 Firebase (各範例共用同一個 Firestore 客戶端)"""
     config = load_config()
     if not config:
         return None
@@ -49,17 +63,23 @@ def initialize_firebase():
         print(f"Firebase 初始化失敗: {e}")
         return None
 
+# 各語言的欄位名稱，於模組載入時預先建立，避免在迴圈中重複組字串
+_LANGUAGES = ('cht', 'chs', 'en', 'ja', 'ko')
+_NAME_KEY = {lang: f'names.{lang}' for lang in _LANGUAGES}
+_TITLE_KEY = {lang: f'title.{lang}' for lang in _LANGUAGES}
+
 def get_card_name(card_data: dict, language: str = 'cht') -> str:
     """從卡片資料中獲取指定語言的名稱"""
-    name_field = f'names.{language}'
-    if name_field in card_data:
-        name_info = card_data[name_field]
-        if isinstance(name_info, dict):
-            name = name_info.get('name', '').strip()
-            if name:
-                return name
+    name_info = card_data.get(_NAME_KEY.get(language) or f'names.{language}')
+    if isinstance(name_info, dict):
+        name = name_info.get('name', '').strip()
+        if name:
+            return name
     return '未知'
 
+# 名稱回退的語言優先順序與對應欄位
+_FALLBACK_KEYS = list(_NAME_KEY.items())
+
 def get_card_name_fallback(card_data: dict, preferred_lang: str = 'cht') -> str:
     """從卡片資料中獲取名稱，如果首選語言不存在則嘗試其他語言"""
     # 嘗試首選語言
@@ -68,15 +88,33 @@ def get_card_name_fallback(card_data: dict, preferred_lang: str = 'cht') -> str:
         return name
     
     # 嘗試其他語言，按優先順序
-    fallback_langs = ['cht', 'chs', 'en', 'ja', 'ko']
-    for lang in fallback_langs:
-        if lang != preferred_lang:
-            name = get_card_name(card_data, lang)
-            if name != '未知':
-                return f"{name} ({lang})"
+    for lang, key in _FALLBACK_KEYS:
+        if lang == preferred_lang:
+            continue
+        name_info = card_data.get(key)
+        if isinstance(name_info, dict) and (name := name_info.get('name', '').strip()):
+            return f"{name} ({lang})"
     
     return '未知'
 
+def count_query(query) -> int:
+    """使用聚合查詢在伺服器端計算符合條件的文件數量"""
+    return query.count().get()[0][0].value
+
+def iter_query_pages(query, order_field: str, batch_size: int = 200):
+    """以游標分頁逐批讀取查詢結果，記憶體中最多只保留一批文件"""
+    query = query.order_by(order_field).limit(batch_size)
+    last_doc = None
+    while True:
+        page = query.start_after(last_doc) if last_doc else query
+        docs = list(page.stream())
+        if not docs:
+            return
+        yield from docs
+        if len(docs) < batch_size:
+            return
+        last_doc = docs[-1]
+
 def example_basic_queries():
     """基本查詢範例"""
     print("=== 基本查詢範例 ===")
@@ -86,41 +124,48 @@ def example_basic_queries():
         return
     
     try:
-        # 1. 查詢卡片總數
+        # 1. 查詢卡片總數（聚合查詢，同時用來判斷是否有資料）
         cards_ref = db.collection('cards')
-        cards = cards_ref.limit(1).get()  # 只取一個來檢查是否有資料
-        
-        if cards:
-            # 使用聚合查詢獲取總數 (需要 Firebase Admin SDK v6.0+)
-            try:
-                from google.cloud.firestore_v1.aggregation import AggregationQuery
-                total_count = cards_ref.count().get()
-                print(f"資料庫中總共有 {total_count[0][0].value} 張卡片")
-            except:
-                # 如果不支援聚合查詢，使用估算
-                print("資料庫中有卡片資料 (無法精確計算總數)")
+        try:
+            total_count = count_query(cards_ref)
+        except Exception:
+            # 如果不支援聚合查詢 (需要 Firebase Admin SDK v6.0+)，改為只檢查是否有資料
+            total_count = None
+        
+        if total_count:
+            print(f"資料庫中總共有 {total_count} 張卡片")
+        elif total_count is None and cards_ref.limit(1).get():
+            print("資料庫中有卡片資料 (無法精確計算總數)")
         else:
             print("資料庫中沒有卡片資料")
             return
         
-        # 2. 查詢各職業卡片數量 (限制每個查詢的結果數量)
-        print("\n各職業卡片數量 (前10張):")
         classes = {
             0: '中立', 1: '精靈', 2: '皇家護衛', 3: '巫師', 
             4: '龍族', 5: '夜魔', 6: '主教', 7: '復仇者'
         }
-        
-        for class_id, class_name in classes.items():
-            class_cards = cards_ref.where('class', '==', class_id).limit(10).get()
-            print(f"  {class_name}: {len(class_cards)} 張 (樣本)")
-        
-        # 3. 查詢各稀有度卡片數量
-        print("\n各稀有度卡片數量 (前10張):")
         rarities = {1: '銅', 2: '銀', 3: '金', 4: '虹'}
         
-        for rarity_id, rarity_name in rarities.items():
-            rarity_cards = cards_ref.where('rarity', '==', rarity_id).limit(10).get()
-            print(f"  {rarity_name}: {len(rarity_cards)} 張 (樣本)")
+        # 各職業與各稀有度的查詢彼此獨立，同時送出 (Firestore 客戶端可跨執行緒共用)
+        with ThreadPoolExecutor(max_workers=len(classes) + len(rarities)) as executor:
+            class_futures = {
+                class_name: executor.submit(count_query, cards_ref.where('class', '==', class_id))
+                for class_id, class_name in classes.items()
+            }
+            rarity_futures = {
+                rarity_name: executor.submit(count_query, cards_ref.where('rarity', '==', rarity_id))
+                for rarity_id, rarity_name in rarities.items()
+            }
+            
+            # 2. 查詢各職業卡片數量 (伺服器端聚合計數，不傳輸文件內容)
+            print("\n各職業卡片數量:")
+            for class_name, future in class_futures.items():
+                print(f"  {class_name}: {future.result()} 張")
+            
+            # 3. 查詢各稀有度卡片數量
+            print("\n各稀有度卡片數量:")
+            for rarity_name, future in rarity_futures.items():
+                print(f"  {rarity_name}: {future.result()} 張")
         
     except Exception as e:
         print(f"查詢時發生錯誤: {e}")
@@ -138,7 +183,7 @@ def example_card_search():
         
         # 1. 查詢特定費用的卡片
         cards_ref = db.collection('cards')
-        cost_5_cards = cards_ref.where('cost', '==', 5).limit(5).get()
+        cost_5_cards = cards_ref.where('cost', '==', 5).limit(5).stream()
         
         print("費用為 5 的卡片:")
         for card in cost_5_cards:
@@ -147,7 +192,7 @@ def example_card_search():
             print(f"  {cht_name} - 費用:{card_data.get('cost')} 攻擊:{card_data.get('atk')} 生命:{card_data.get('life')}")
         
         # 2. 查詢高攻擊力卡片
-        high_atk_cards = cards_ref.where('atk', '>=', 8).limit(5).get()
+        high_atk_cards = cards_ref.where('atk', '>=', 8).limit(5).stream()
         
         print("\n高攻擊力卡片 (攻擊 >= 8):")
         for card in high_atk_cards:
@@ -170,7 +215,7 @@ def example_complex_queries():
         cards_ref = db.collection('cards')
         
         # 1. 查詢特定職業和費用的卡片
-        elf_cost_3 = cards_ref.where('class', '==', 1).where('cost', '==', 3).limit(5).get()
+        elf_cost_3 = cards_ref.where('class', '==', 1).where('cost', '==', 3).limit(5).stream()
         
         print("精靈職業費用 3 的卡片:")
         for card in elf_cost_3:
@@ -179,7 +224,7 @@ def example_complex_queries():
             print(f"  {cht_name} - 攻擊:{card_data.get('atk')} 生命:{card_data.get('life')}")
         
         # 2. 查詢非isToken卡片
-        non_token_cards = cards_ref.where('isToken', '==', False).limit(5).get()
+        non_token_cards = cards_ref.where('isToken', '==', False).limit(5).stream()
         
         print("\n非isToken卡片:")
         for card in non_token_cards:
@@ -190,30 +235,23 @@ def example_complex_queries():
         # 3. 查詢包含特定種族的卡片
         # 查詢更多卡片來找到有種族的卡片
         all_cards = cards_ref.limit(100).get()
-        cards_with_tribes = [card for card in all_cards if card.to_dict().get('tribes', [])]
-        
-        if cards_with_tribes:
-            # 收集所有種族ID並使用第一個進行查詢
-            found_tribes = set()
-            for card in cards_with_tribes:
-                tribes = card.to_dict().get('tribes', [])
-                if tribes:
-                    found_tribes.update(tribes)
+        # 單次走訪：每張卡片只轉換一次，同時依種族分桶
+        tribe_buckets = defaultdict(list)
+        for card in all_cards:
+            card_data = card.to_dict()
+            for tribe_id in set(card_data.get('tribes', [])):
+                tribe_buckets[tribe_id].append(card_data)
+        
+        if tribe_buckets:
+            # 使用ID最小的種族進行查詢
+            first_tribe = min(tribe_buckets)
+            tribe_cards = tribe_buckets[first_tribe]
             
-            if found_tribes:
-                first_tribe = min(found_tribes)
-                # 從所有卡片中過濾包含該種族的卡片
-                tribe_cards = [card for card in all_cards 
-                             if first_tribe in card.to_dict().get('tribes', [])]
-                
-                print(f"\n包含種族 {first_tribe} 的卡片:")
-                for card in tribe_cards[:5]:  # 只顯示前5張
-                    card_data = card.to_dict()
-                    card_name = get_card_name_fallback(card_data)
-                    tribes = card_data.get('tribes', [])
-                    print(f"  {card_name} - 種族:{tribes}")
-            else:
-                print("\n未找到有效的種族資料")
+            print(f"\n包含種族 {first_tribe} 的卡片:")
+            for card_data in tribe_cards[:5]:  # 只顯示前5張
+                card_name = get_card_name_fallback(card_data)
+                tribes = card_data.get('tribes', [])
+                print(f"  {card_name} - 種族:{tribes}")
         else:
             print("\n未找到有種族的卡片")
         
@@ -267,17 +305,21 @@ def example_subcollection_queries():
         return
     
     try:
-        # 查詢有問答的卡片
+        # 查詢有問答的卡片 (同步時寫入的 hasQuestions 旗標)
         cards_ref = db.collection('cards')
-        cards = cards_ref.limit(5).get()
+        cards = cards_ref.where('hasQuestions', '==', True).limit(5).get()
+        if not cards:
+            # 舊資料尚未有 hasQuestions 欄位，退回逐張探測
+            cards = cards_ref.limit(5).get()
         
         cards_with_questions = 0
         
-        for card in cards:
-            card_id = card.id
-            questions_ref = card.reference.collection('questions')
-            questions = questions_ref.limit(1).get()
-            
+        # 每張卡片只查一次 (前3筆即可同時判斷有無問答並顯示)，各卡片的查詢同時送出
+        with ThreadPoolExecutor(max_workers=max(len(cards), 1)) as executor:
+            questions_per_card = list(executor.map(
+                lambda card: card.reference.collection('questions').limit(3).get(), cards))
+        
+        for card, questions in zip(cards, questions_per_card):
             if questions:
                 cards_with_questions += 1
                 card_data = card.to_dict()
@@ -286,8 +328,7 @@ def example_subcollection_queries():
                 print(f"卡片 {cht_name} 有問答資料:")
                 
                 # 顯示問答內容
-                all_questions = questions_ref.limit(3).get()
-                for q in all_questions:
+                for q in questions:
                     q_data = q.to_dict()
                     print(f"  Q: {q_data.get('question', '')}")
                     print(f"  A: {q_data.get('answer', '')}")
@@ -307,10 +348,18 @@ def example_reference_data():
         return
     
     try:
-        # 查詢卡包資料
+        # 三個參考集合互不相依，同時送出查詢
         card_sets_ref = db.collection('cardSets')
-        card_sets = card_sets_ref.limit(5).get()
+        tribes_ref = db.collection('tribes')
+        skills_ref = db.collection('skills')
         
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            card_sets, tribes, skills = executor.map(
+                lambda ref: ref.limit(5).get(),
+                [card_sets_ref, tribes_ref, skills_ref]
+            )
+        
+        # 查詢卡包資料
         print("卡包資料:")
         for card_set in card_sets:
             set_data = card_set.to_dict()
@@ -319,9 +368,6 @@ def example_reference_data():
             print(f"  ID {card_set.id}: {cht_name}")
         
         # 查詢種族資料
-        tribes_ref = db.collection('tribes')
-        tribes = tribes_ref.limit(5).get()
-        
         print("\n種族資料:")
         for tribe in tribes:
             tribe_data = tribe.to_dict()
@@ -330,9 +376,6 @@ def example_reference_data():
             print(f"  ID {tribe.id}: {cht_name}")
         
         # 查詢技能資料
-        skills_ref = db.collection('skills')
-        skills = skills_ref.limit(5).get()
-        
         print("\n技能資料:")
         for skill in skills:
             skill_data = skill.to_dict()
@@ -354,7 +397,7 @@ def example_sync_logs():
     try:
         # 查詢最近的同步記錄
         sync_logs_ref = db.collection('syncLogs')
-        recent_logs = sync_logs_ref.order_by('createdAt', direction=firestore.Query.DESCENDING).limit(5).get()
+        recent_logs = sync_logs_ref.order_by('createdAt', direction=firestore.Query.DESCENDING).limit(5).stream()
         
         print("最近的同步記錄:")
         for log in recent_logs:
@@ -374,7 +417,7 @@ def example_sync_logs():
             print(f"  {language} - {status} - {successful_cards}/{total_cards} 張成功 - {created_time}")
         
         # 查詢特定語言的同步記錄
-        cht_logs = sync_logs_ref.where('language', '==', 'cht').limit(3).get()
+        cht_logs = sync_logs_ref.where('language', '==', 'cht').limit(3).stream()
         
         print(f"\n繁體中文同步記錄:")
         for log in cht_logs:
@@ -401,7 +444,7 @@ def example_advanced_filtering():
         cards_ref = db.collection('cards')
         
         # 1. 查詢費用範圍內的卡片
-        mid_cost_cards = cards_ref.where('cost', '>=', 4).where('cost', '<=', 6).limit(5).get()
+        mid_cost_cards = cards_ref.where('cost', '>=', 4).where('cost', '<=', 6).limit(5).stream()
         
         print("中費用卡片 (4-6費):")
         for card in mid_cost_cards:
@@ -410,7 +453,7 @@ def example_advanced_filtering():
             print(f"  {cht_name} - 費用:{card_data.get('cost')} 攻擊:{card_data.get('atk')}")
         
         # 2. 查詢輪替制中的高稀有度卡片
-        rotation_legendaries = cards_ref.where('isIncludeRotation', '==', True).where('rarity', '==', 4).limit(3).get()
+        rotation_legendaries = cards_ref.where('isIncludeRotation', '==', True).where('rarity', '==', 4).limit(3).stream()
         
         print("\n輪替制中的傳說卡片:")
         for card in rotation_legendaries:
@@ -419,7 +462,7 @@ def example_advanced_filtering():
             print(f"  {cht_name} - 職業:{card_data.get('class')} 費用:{card_data.get('cost')}")
         
         # 3. 使用 in 查詢多個值
-        neutral_and_elf = cards_ref.where('class', 'in', [0, 1]).limit(5).get()
+        neutral_and_elf = cards_ref.where('class', 'in', [0, 1]).limit(5).stream()
         
         print("\n中立和精靈卡片:")
         for card in neutral_and_elf:
@@ -448,7 +491,7 @@ def example_tips_queries():
         
         # 2. 搜尋包含特定關鍵字的Tips
         keyword = "從者"
-        tips_docs = tips_ref.limit(50).get()  # 先獲取一批Tips
+        tips_docs = tips_ref.limit(50).stream()  # 逐筆讀取一批Tips，湊滿3條即停止
         
         matching_tips = []
         for doc in tips_docs:
@@ -456,6 +499,8 @@ def example_tips_queries():
             # 檢查繁體中文標題是否包含關鍵字
             if 'title.cht' in tip_data and keyword in tip_data['title.cht']:
                 matching_tips.append(tip_data)
+                if len(matching_tips) >= 3:
+                    break
         
         print(f"\n包含 '{keyword}' 的Tips:")
         for tip in matching_tips[:3]:  # 只顯示前3條
@@ -466,7 +511,7 @@ def example_tips_queries():
             print()
         
         # 3. 多語言Tips比較
-        tips_sample = tips_ref.limit(2).get()
+        tips_sample = tips_ref.limit(2).stream()
         
         print("多語言Tips比較:")
         for doc in tips_sample:
@@ -483,7 +528,7 @@ def example_tips_queries():
             print()
         
         # 4. 按索引排序的Tips
-        ordered_tips = tips_ref.order_by('index').limit(5).get()
+        ordered_tips = tips_ref.order_by('index').limit(5).stream()
         
         print("按索引排序的Tips (前5條):")
         for doc in ordered_tips:
@@ -495,33 +540,45 @@ def example_tips_queries():
         
         # 5. 搜尋特定遊戲概念的Tips
         concepts = ["職業", "法術", "護符"]
-        all_tips = tips_ref.get()
         
-        for concept in concepts:
-            found_tip = None
-            for doc in all_tips:
+        # 優先以同步時寫入的 keywords 欄位做索引查詢，各概念同時送出
+        with ThreadPoolExecutor(max_workers=len(concepts)) as executor:
+            keyword_hits = executor.map(
+                lambda concept: tips_ref.where('keywords', 'array_contains', concept).order_by('index').limit(1).get(),
+                concepts
+            )
+            found_tips = {concept: docs[0].to_dict() for concept, docs in zip(concepts, keyword_hits) if docs}
+        
+        # 尚未建立 keywords 的舊資料，退回依索引分頁掃描，每個概念保留第一條符合的Tips
+        missing = [concept for concept in concepts if concept not in found_tips]
+        if missing:
+            for doc in iter_query_pages(tips_ref, 'index'):
                 tip_data = doc.to_dict()
                 title = tip_data.get('title.cht', '')
                 desc = tip_data.get('desc.cht', '')
-                
-                if concept in title or concept in desc:
-                    found_tip = tip_data
+                for concept in missing:
+                    if concept not in found_tips and (concept in title or concept in desc):
+                        found_tips[concept] = tip_data
+                if len(found_tips) == len(concepts):
                     break
-            
+        
+        for concept in concepts:
+            found_tip = found_tips.get(concept)
             if found_tip:
                 title = found_tip.get('title.cht', '未知標題')
                 desc = found_tip.get('desc.cht', '未知說明')
                 print(f"\n關於 '{concept}' 的Tips:")
                 print(f"  {title}: {desc}")
         
-        # 6. 統計各語言的Tips數量
-        language_stats = {'cht': 0, 'chs': 0, 'en': 0, 'ja': 0, 'ko': 0}
-        
-        for doc in all_tips:
-            tip_data = doc.to_dict()
-            for lang in language_stats.keys():
-                if f'title.{lang}' in tip_data and tip_data[f'title.{lang}']:
-                    language_stats[lang] += 1
+        # 6. 統計各語言的Tips數量（伺服器端聚合，不傳輸任何文件）
+        # 欄位名稱本身含有'.'，需以FieldPath跳脫
+        with ThreadPoolExecutor(max_workers=len(_LANGUAGES)) as executor:
+            language_stats = dict(zip(_LANGUAGES, executor.map(
+                lambda lang: count_query(tips_ref.where(
+                    firestore.FieldPath(_TITLE_KEY[lang]).to_api_repr(), '!=', ''
+                )),
+                _LANGUAGES
+            )))
         
         print(f"\n各語言Tips統計:")
         lang_names = {'cht': '繁體中文', 'chs': '簡體中文', 'en': '英文', 'ja': '日文', 'ko': '韓文'}
@@ -9,15 +9,14 @@ import os
 import sys
 import json
 import logging
+from datetime import datetime, timezone
 from pathlib import Path
 from typing import Dict, Any
 
 try:
-    import firebase_admin
-    from firebase_admin import credentials, firestore
-except ImportError:
-    print("請先安裝 Firebase Admin SDK: pip install firebase-admin")
-    sys.exit(1)
+    import orjson
+except ImportError:  # 未安裝時退回標準函式庫 json
+    orjson = None
 
 # 設定日誌
 logging.basicConfig(
@@ -26,41 +25,295 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+def _dump_json_bytes(obj: Any) -> bytes:
+    """序列化為縮排 2 格的 UTF-8 JSON bytes；有 orjson 時使用 orjson"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, indent=2, ensure_ascii=False).encode('utf-8')
+
+# Firestore 索引配置 (需要手動在 Firebase Console 建立，或使用 Firebase CLI 部署)
+# 複合索引規格：(集合, ((欄位, 排序或 CONTAINS), ...))
+_INDEX_SPEC = (
+    ("cards", (("class", "ASCENDING"), ("cost", "ASCENDING"))),
+    ("cards", (("rarity", "ASCENDING"), ("class", "ASCENDING"))),
+    ("cards", (("cardSetId", "ASCENDING"), ("class", "ASCENDING"))),
+    ("cards", (("isToken", "ASCENDING"), ("isIncludeRotation", "ASCENDING"))),
+    # 涵蓋 class == / cost == / rarity == 三重篩選，免去內建單欄位索引的 merge-join
+    ("cards", (("class", "ASCENDING"), ("cost", "ASCENDING"), ("rarity", "ASCENDING"))),
+    # 涵蓋依卡包瀏覽時 cardSetId == / cost == / class == 的篩選
+    ("cards", (("cardSetId", "ASCENDING"), ("cost", "ASCENDING"), ("class", "ASCENDING"))),
+    ("syncLogs", (("language", "ASCENDING"), ("createdAt", "DESCENDING"))),
+    ("syncLogs", (("syncStatus", "ASCENDING"), ("createdAt", "DESCENDING"))),
+    ("tips", (("keywords", "CONTAINS"), ("index", "ASCENDING"))),
+)
+
+# 陣列欄位的單欄位索引覆寫規格：(集合, 欄位)
+_ARRAY_OVERRIDE_SPEC = (
+    ("cards", "tribes"),
+    ("cards", "relatedCards"),
+)
+
+# 卡片資料的語言代碼
+_LANGUAGES = ("cht", "chs", "en", "ja", "ko")
+
+# 不參與查詢的大型 map/陣列欄位，關閉自動單欄位索引以減少每次寫入的索引展開：(集合, 欄位)
+# firebase_sync 以 set() 寫入 names.{語言} 等鍵，欄位名稱本身含有句點，需以反引號跳脫
+_UNINDEXED_FIELD_SPEC = tuple(
+    ("cards", f"`{field}`")
+    for language in _LANGUAGES
+    for field in (
+        f"names.{language}",
+        f"images.{language}",
+        f"descriptions.{language}.common",
+        f"descriptions.{language}.evo",
+    )
+) + (
+    ("cards", "specificEffectCards"),
+)
+
+def _expand_index_field(field_path: str, mode: str) -> Dict[str, str]:
+    """將 (欄位, 排序或 CONTAINS) 展開為索引欄位設定"""
+    if mode == "CONTAINS":
+        return {"fieldPath": field_path, "arrayConfig": mode}
+    return {"fieldPath": field_path, "order": mode}
+
+def _expand_indexes(index_spec, override_spec, unindexed_spec=()) -> Dict[str, Any]:
+    """由精簡規格產生 firestore.indexes.json 的完整結構"""
+    return {
+        "indexes": [
+            {
+                "collectionGroup": collection,
+                "queryScope": "COLLECTION",
+                "fields": [_expand_index_field(field_path, mode) for field_path, mode in fields]
+            }
+            for collection, fields in index_spec
+        ],
+        "fieldOverrides": [
+            {
+                "collectionGroup": collection,
+                "fieldPath": field_path,
+                "indexes": [
+                    {"arrayConfig": "CONTAINS", "queryScope": "COLLECTION"}
+                ]
+            }
+            for collection, field_path in override_spec
+        ] + [
+            # 空的 indexes 代表停用該欄位 (含子欄位) 的所有自動索引
+            {"collectionGroup": collection, "fieldPath": field_path, "indexes": []}
+            for collection, field_path in unindexed_spec
+        ]
+    }
+
+INDEXES_CONFIG = _expand_indexes(_INDEX_SPEC, _ARRAY_OVERRIDE_SPEC, _UNINDEXED_FIELD_SPEC)
+
+# 索引配置序列化結果，於載入時產生一次
+INDEXES_JSON_BYTES = _dump_json_bytes(INDEXES_CONFIG)
+
+# Firestore 安全規則
+SECURITY_RULES = '''rules_version = '2';
+service cloud.firestore {
+  match /databases/{database}/documents {
+    // 卡片資料 - 讀取公開，寫入需要認證
+    match /cards/{cardId} {
+      allow read: if true;
+      allow write: if request.auth != null;
+      
+      // 卡片問答子集合
+      match /questions/{questionId} {
+        allow read: if true;
+        allow write: if request.auth != null;
+      }
+      
+      // 卡片風格變體子集合
+      match /styles/{styleId} {
+        allow read: if true;
+        allow write: if request.auth != null;
+      }
+    }
+    
+    // 卡包資料 - 讀取公開，寫入需要認證
+    match /cardSets/{setId} {
+      allow read: if true;
+      allow write: if request.auth != null;
+    }
+    
+    // 種族資料 - 讀取公開，寫入需要認證
+    match /tribes/{tribeId} {
+      allow read: if true;
+      allow write: if request.auth != null;
+    }
+    
+    // 技能資料 - 讀取公開，寫入需要認證
+    match /skills/{skillId} {
+      allow read: if true;
+      allow write: if request.auth != null;
+    }
+    
+    // 同步記錄 - 需要認證
+    match /syncLogs/{logId} {
+      allow read, write: if request.auth != null;
+    }
+  }
+}'''
+
+SECURITY_RULES_BYTES = SECURITY_RULES.encode('utf-8')
+
+# 範例資料：(集合, 文件ID, 內容)；時間戳於寫入時補上
+SAMPLE_DATA = (
+    # 範例卡包
+    ('cardSets', '1', {
+        'id': 1,
+        'names': {
+            'cht': '基本卡包',
+            'chs': '基本卡包',
+            'en': 'Basic Set',
+            'ja': 'ベーシックセット',
+            'ko': '기본 세트'
+        }
+    }),
+
+    # 範例種族
+    ('tribes', '1', {
+        'id': 1,
+        'names': {
+            'cht': '天使',
+            'chs': '天使',
+            'en': 'Angel',
+            'ja': '天使',
+            'ko': '천사'
+        }
+    }),
+
+    # 範例技能
+    ('skills', '1', {
+        'id': 1,
+        'names': {
+            'cht': '守護',
+            'chs': '守护',
+            'en': 'Ward',
+            'ja': '守護',
+            'ko': '수호'
+        }
+    }),
+
+    # 範例卡片
+    ('cards', '900011010', {
+        'id': 900011010,
+        'baseCardId': 900011010,
+        'cardResourceId': 900011010,
+        'cardSetId': 1,
+        'type': 1,  # 從者
+        'class': 0,  # 中立
+        'cost': 2,
+        'atk': 2,
+        'life': 1,
+        'rarity': 1,  # 銅
+        'isToken': False,
+        'isIncludeRotation': True,
+        'cardImageHash': 'sample_hash',
+        'cardBannerImageHash': 'sample_banner_hash',
+        'names': {
+            'cht': {'name': '雙刃哥布林', 'nameRuby': ''},
+            'chs': {'name': '双刃哥布林', 'nameRuby': ''},
+            'en': {'name': 'Goblin', 'nameRuby': ''},
+            'ja': {'name': 'ゴブリン', 'nameRuby': ''},
+            'ko': {'name': '고블린', 'nameRuby': ''}
+        },
+        'descriptions': {
+            'cht': {
+                'common': {
+                    'flavourText': '最普通的哥布林。',
+                    'skillText': '',
+                    'cv': '',
+                    'illustrator': '範例繪師'
+                }
+            }
+        },
+        'tribes': [1],
+        'relatedCards': [],
+        'specificEffectCards': []
+    }),
+)
+
+def _write_if_changed(path: str, payload: bytes) -> bool:
+    """內容與現有檔案不同時才寫入，回傳是否有寫入"""
+    try:
+        with open(path, 'rb') as f:
+            if f.read() == payload:
+                return False
+    except FileNotFoundError:
+        pass
+    
+    # 直接以檔案描述子寫入 bytes，略過 Python 檔案物件的緩衝層
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        view = memoryview(payload)
+        while view:
+            view = view[os.write(fd, view):]
+    finally:
+        os.close(fd)
+    return True
+
 class FirebaseInitializer:
     """Firebase 初始化器"""
     
+    # 同一個行程內所有初始化器共用的 Firestore 客戶端 (呼叫端請勿自行 close)
+    _shared_db = None
+    
     def __init__(self, config_path: str = 'firebase/config.json'):
         self.config_path = config_path
         self.app = None
         self.db = None
+        self._config = None
+        self._dir_ready = False
         
     def load_config(self) -> Dict[str, Any]:
-        """載入 Firebase 配置"""
-        if not os.path.exists(self.config_path):
-            raise FileNotFoundError(f"找不到配置檔案: {self.config_path}")
-        
-        with open(self.config_path, 'r', encoding='utf-8') as f:
-            return json.load(f)
+        """載入 Firebase 配置 (同一個初始化器只讀取並解析一次)"""
+        if self._config is None:
+            # 直接開檔，檔案不存在時由 open 拋出，省去額外的 stat
+            try:
+                with open(self.config_path, 'rb') as f:
+                    raw = f.read()
+            except FileNotFoundError as e:
+                raise FileNotFoundError(f"找不到配置檔案: {self.config_path}") from e
+            self._config = orjson.loads(raw) if orjson is not None else json.loads(raw)
+        return self._config
     
     def initialize_app(self) -> bool:
-        """初始化 Firebase 應用程式"""
+        """初始化 Firebase 應用程式 (重複呼叫時直接沿用已初始化的客戶端)"""
+        if self.db is not None:
+            return True
+        
+        # 僅在需要連線時才載入 Firebase Admin SDK (grpc、protobuf 載入成本高)，config 等子指令不受影響
+        try:
+            import firebase_admin
+            from firebase_admin import credentials, firestore
+        except ImportError:
+            print("請先安裝 Firebase Admin SDK: pip install firebase-admin")
+            sys.exit(1)
+        
         try:
             config = self.load_config()
             
-            # 檢查服務帳戶金鑰檔案
+            # 檢查服務帳戶金鑰設定 (檔案是否存在交由 credentials.Certificate 開檔時判斷)
             service_account_path = config.get('service_account_key_path')
-            if not service_account_path or not os.path.exists(service_account_path):
+            if not service_account_path:
                 raise FileNotFoundError(f"找不到服務帳戶金鑰檔案: {service_account_path}")
             
             # 初始化 Firebase Admin SDK
             if not firebase_admin._apps:
-                cred = credentials.Certificate(service_account_path)
+                try:
+                    cred = credentials.Certificate(service_account_path)
+                except FileNotFoundError as e:
+                    raise FileNotFoundError(f"找不到服務帳戶金鑰檔案: {service_account_path}") from e
                 self.app = firebase_admin.initialize_app(cred, {
                     'projectId': config.get('project_id')
                 })
             
-            # 獲取 Firestore 客戶端
-            self.db = firestore.client()
+            # 獲取 Firestore 客戶端 (第一次建立後共用同一個連線通道)
+            if FirebaseInitializer._shared_db is None:
+                FirebaseInitializer._shared_db = firestore.client()
+            self.db = FirebaseInitializer._shared_db
             
             logger.info("✓ Firebase 初始化成功")
             return True
@@ -69,89 +322,24 @@ class FirebaseInitializer:
             logger.error(f"✗ Firebase 初始化失敗: {e}")
             return False
     
+    def _ensure_output_dir(self) -> None:
+        """確保輸出目錄存在 (每個初始化器只檢查一次)"""
+        if not self._dir_ready:
+            os.makedirs('firebase', exist_ok=True)
+            self._dir_ready = True
+    
     def create_indexes(self) -> bool:
         """建立 Firestore 索引 (需要手動在 Firebase Console 建立)"""
         logger.info("建立 Firestore 索引...")
         
-        # Firestore 索引需要在 Firebase Console 手動建立，或使用 Firebase CLI
-        # 這裡提供索引配置資訊
-        indexes_config = {
-            "indexes": [
-                {
-                    "collectionGroup": "cards",
-                    "queryScope": "COLLECTION",
-                    "fields": [
-                        {"fieldPath": "class", "order": "ASCENDING"},
-                        {"fieldPath": "cost", "order": "ASCENDING"}
-                    ]
-                },
-                {
-                    "collectionGroup": "cards",
-                    "queryScope": "COLLECTION",
-                    "fields": [
-                        {"fieldPath": "rarity", "order": "ASCENDING"},
-                        {"fieldPath": "class", "order": "ASCENDING"}
-                    ]
-                },
-                {
-                    "collectionGroup": "cards",
-                    "queryScope": "COLLECTION",
-                    "fields": [
-                        {"fieldPath": "cardSetId", "order": "ASCENDING"},
-                        {"fieldPath": "class", "order": "ASCENDING"}
-                    ]
-                },
-                {
-                    "collectionGroup": "cards",
-                    "queryScope": "COLLECTION",
-                    "fields": [
-                        {"fieldPath": "isToken", "order": "ASCENDING"},
-                        {"fieldPath": "isIncludeRotation", "order": "ASCENDING"}
-                    ]
-                },
-                {
-                    "collectionGroup": "syncLogs",
-                    "queryScope": "COLLECTION",
-                    "fields": [
-                        {"fieldPath": "language", "order": "ASCENDING"},
-                        {"fieldPath": "createdAt", "order": "DESCENDING"}
-                    ]
-                },
-                {
-                    "collectionGroup": "syncLogs",
-                    "queryScope": "COLLECTION",
-                    "fields": [
-                        {"fieldPath": "syncStatus", "order": "ASCENDING"},
-                        {"fieldPath": "createdAt", "order": "DESCENDING"}
-                    ]
-                }
-            ],
-            "fieldOverrides": [
-                {
-                    "collectionGroup": "cards",
-                    "fieldPath": "tribes",
-                    "indexes": [
-                        {"arrayConfig": "CONTAINS", "queryScope": "COLLECTION"}
-                    ]
-                },
-                {
-                    "collectionGroup": "cards",
-                    "fieldPath": "relatedCards",
-                    "indexes": [
-                        {"arrayConfig": "CONTAINS", "queryScope": "COLLECTION"}
-                    ]
-                }
-            ]
-        }
-        
         # 儲存索引配置到檔案
         indexes_file = 'firebase/firestore.indexes.json'
-        os.makedirs('firebase', exist_ok=True)
-        
-        with open(indexes_file, 'w', encoding='utf-8') as f:
-            json.dump(indexes_config, f, indent=2, ensure_ascii=False)
+        self._ensure_output_dir()
         
-        logger.info(f"✓ 索引配置已儲存到 {indexes_file}")
+        if _write_if_changed(indexes_file, INDEXES_JSON_BYTES):
+            logger.info(f"✓ 索引配置已儲存到 {indexes_file}")
+        else:
+            logger.info(f"✓ 索引配置未變更，略過寫入 {indexes_file}")
         logger.info("請使用 Firebase CLI 部署索引:")
         logger.info("  firebase deploy --only firestore:indexes")
         
@@ -161,57 +349,12 @@ class FirebaseInitializer:
         """建立 Firestore 安全規則檔案"""
         logger.info("建立 Firestore 安全規則...")
         
-        rules_content = '''rules_version = '2';
-service cloud.firestore {
-  match /databases/{database}/documents {
-    // 卡片資料 - 讀取公開，寫入需要認證
-    match /cards/{cardId} {
-      allow read: if true;
-      allow write: if request.auth != null;
-      
-      // 卡片問答子集合
-      match /questions/{questionId} {
-        allow read: if true;
-        allow write: if request.auth != null;
-      }
-      
-      // 卡片風格變體子集合
-      match /styles/{styleId} {
-        allow read: if true;
-        allow write: if request.auth != null;
-      }
-    }
-    
-    // 卡包資料 - 讀取公開，寫入需要認證
-    match /cardSets/{setId} {
-      allow read: if true;
-      allow write: if request.auth != null;
-    }
-    
-    // 種族資料 - 讀取公開，寫入需要認證
-    match /tribes/{tribeId} {
-      allow read: if true;
-      allow write: if request.auth != null;
-    }
-    
-    // 技能資料 - 讀取公開，寫入需要認證
-    match /skills/{skillId} {
-      allow read: if true;
-      allow write: if request.auth != null;
-    }
-    
-    // 同步記錄 - 需要認證
-    match /syncLogs/{logId} {
-      allow read, write: if request.auth != null;
-    }
-  }
-}'''
-        
         rules_file = 'firebase/firestore.rules'
-        with open(rules_file, 'w', encoding='utf-8') as f:
-            f.write(rules_content)
-        
-        logger.info(f"✓ 安全規則已儲存到 {rules_file}")
+        self._ensure_output_dir()
+        if _write_if_changed(rules_file, SECURITY_RULES_BYTES):
+            logger.info(f"✓ 安全規則已儲存到 {rules_file}")
+        else:
+            logger.info(f"✓ 安全規則未變更，略過寫入 {rules_file}")
         logger.info("請使用 Firebase CLI 部署安全規則:")
         logger.info("  firebase deploy --only firestore:rules")
         
@@ -222,9 +365,8 @@ service cloud.firestore {
         logger.info("測試 Firestore 連線...")
         
         try:
-            # 嘗試讀取一個不存在的文件來測試連線
-            test_ref = self.db.collection('test').document('connection_test')
-            test_ref.get()
+            # 列出集合並只取第一個結果即停止，同時驗證連線、憑證與專案設定，不必讀取虛擬文件
+            next(iter(self.db.collections()), None)
             
             logger.info("✓ Firestore 連線測試成功")
             return True
@@ -238,91 +380,18 @@ service cloud.firestore {
         logger.info("建立範例資料...")
         
         try:
-            # 建立範例卡包
-            card_set_ref = self.db.collection('cardSets').document('1')
-            card_set_ref.set({
-                'id': 1,
-                'names': {
-                    'cht': '基本卡包',
-                    'chs': '基本卡包',
-                    'en': 'Basic Set',
-                    'ja': 'ベーシックセット',
-                    'ko': '기본 세트'
-                },
-                'createdAt': firestore.SERVER_TIMESTAMP,
-                'updatedAt': firestore.SERVER_TIMESTAMP
-            })
-            
-            # 建立範例種族
-            tribe_ref = self.db.collection('tribes').document('1')
-            tribe_ref.set({
-                'id': 1,
-                'names': {
-                    'cht': '天使',
-                    'chs': '天使',
-                    'en': 'Angel',
-                    'ja': '天使',
-                    'ko': '천사'
-                },
-                'createdAt': firestore.SERVER_TIMESTAMP,
-                'updatedAt': firestore.SERVER_TIMESTAMP
-            })
-            
-            # 建立範例技能
-            skill_ref = self.db.collection('skills').document('1')
-            skill_ref.set({
-                'id': 1,
-                'names': {
-                    'cht': '守護',
-                    'chs': '守护',
-                    'en': 'Ward',
-                    'ja': '守護',
-                    'ko': '수호'
-                },
-                'createdAt': firestore.SERVER_TIMESTAMP,
-                'updatedAt': firestore.SERVER_TIMESTAMP
-            })
+            # 範例資料共用同一個客戶端時間戳，不必由伺服器逐筆解析 SERVER_TIMESTAMP
+            now = datetime.now(timezone.utc)
+            items = [
+                (collection, doc_id, {**data, 'createdAt': now, 'updatedAt': now})
+                for collection, doc_id, data in SAMPLE_DATA
+            ]
             
-            # 建立範例卡片
-            card_ref = self.db.collection('cards').document('900011010')
-            card_ref.set({
-                'id': 900011010,
-                'baseCardId': 900011010,
-                'cardResourceId': 900011010,
-                'cardSetId': 1,
-                'type': 1,  # 從者
-                'class': 0,  # 中立
-                'cost': 2,
-                'atk': 2,
-                'life': 1,
-                'rarity': 1,  # 銅
-                'isToken': False,
-                'isIncludeRotation': True,
-                'cardImageHash': 'sample_hash',
-                'cardBannerImageHash': 'sample_banner_hash',
-                'names': {
-                    'cht': {'name': '雙刃哥布林', 'nameRuby': ''},
-                    'chs': {'name': '双刃哥布林', 'nameRuby': ''},
-                    'en': {'name': 'Goblin', 'nameRuby': ''},
-                    'ja': {'name': 'ゴブリン', 'nameRuby': ''},
-                    'ko': {'name': '고블린', 'nameRuby': ''}
-                },
-                'descriptions': {
-                    'cht': {
-                        'common': {
-                            'flavourText': '最普通的哥布林。',
-                            'skillText': '',
-                            'cv': '',
-                            'illustrator': '範例繪師'
-                        }
-                    }
-                },
-                'tribes': [1],
-                'relatedCards': [],
-                'specificEffectCards': [],
-                'createdAt': firestore.SERVER_TIMESTAMP,
-                'updatedAt': firestore.SERVER_TIMESTAMP
-            })
+            # 範例資料遠少於單一批次上限，一次 Commit 寫入
+            batch = self.db.batch()
+            for collection, doc_id, data in items:
+                batch.set(self.db.collection(collection).document(doc_id), data)
+            batch.commit()
             
             logger.info("✓ 範例資料建立成功")
             return True
@@ -341,15 +410,27 @@ def create_config_file():
         return True
     
     print("建立 Firebase 配置檔案...")
-    print("請輸入您的 Firebase 專案資訊:")
     
-    project_id = input("Firebase Project ID: ").strip()
-    service_account_path = input("服務帳戶金鑰檔案路徑: ").strip()
+    # 優先讀取環境變數 (CI、Docker 等非互動環境)，未設定時才詢問
+    project_id = os.environ.get('FIREBASE_PROJECT_ID', '').strip()
+    # 與 firebase_sync.py 相同：FIREBASE_SERVICE_ACCOUNT_KEY_PATH 優先，也接受 FIREBASE_SERVICE_ACCOUNT_KEY
+    service_account_path = (os.environ.get('FIREBASE_SERVICE_ACCOUNT_KEY_PATH')
+                            or os.environ.get('FIREBASE_SERVICE_ACCOUNT_KEY', '')).strip()
+    
+    if not (project_id and service_account_path):
+        print("請輸入您的 Firebase 專案資訊:")
+    if not project_id:
+        project_id = input("Firebase Project ID: ").strip()
+    if not service_account_path:
+        service_account_path = input("服務帳戶金鑰檔案路徑: ").strip()
     
     if not all([project_id, service_account_path]):
         print("✗ 配置資訊不完整")
         return False
     
+    # 一次展開並正規化金鑰路徑後存入配置
+    service_account_path = str(Path(service_account_path).expanduser().resolve())
+    
     config = {
         "project_id": project_id,
         "service_account_key_path": service_account_path
@@ -359,8 +440,8 @@ def create_config_file():
         os.makedirs('firebase', exist_ok=True)
         
         # 建立配置檔案
-        with open(config_path, 'w', encoding='utf-8') as f:
-            json.dump(config, f, indent=2, ensure_ascii=False)
+        with open(config_path, 'wb') as f:
+            f.write(_dump_json_bytes(config))
         
         # 建立範例配置檔案
         example_config = {
@@ -368,8 +449,8 @@ def create_config_file():
             "service_account_key_path": "path/to/your/service-account-key.json"
         }
         
-        with open(example_path, 'w', encoding='utf-8') as f:
-            json.dump(example_config, f, indent=2, ensure_ascii=False)
+        with open(example_path, 'wb') as f:
+            f.write(_dump_json_bytes(example_config))
         
         print("✓ Firebase 配置檔案建立完成")
         return True
@@ -378,60 +459,61 @@ def create_config_file():
         print(f"✗ 建立配置檔案失敗: {e}")
         return False
 
+def _run_init():
+    """init 子指令：初始化 Firebase 並產生索引與安全規則"""
+    initializer = FirebaseInitializer()
+    
+    print("=== Firebase 初始化 ===")
+    
+    # 初始化應用程式
+    if not initializer.initialize_app():
+        return
+    
+    # 測試連線
+    if not initializer.test_connection():
+        return
+    
+    # 建立索引配置
+    initializer.create_indexes()
+    
+    # 建立安全規則
+    initializer.create_security_rules()
+    
+    # 建立範例資料
+    if input("\n是否建立範例資料? (y/N): ").lower() == 'y':
+        initializer.create_sample_data()
+    
+    print("\n🎉 Firebase 初始化完成！")
+    print("接下來請執行:")
+    print("  firebase deploy --only firestore:indexes,firestore:rules")
+    print("  python firebase_sync.py")
+
+def _run_test():
+    """test 子指令：測試 Firestore 連線"""
+    initializer = FirebaseInitializer()
+    if initializer.initialize_app():
+        initializer.test_connection()
+
 def main():
     """主函數"""
-    if len(sys.argv) > 1:
-        command = sys.argv[1]
-        
-        if command == 'config':
-            create_config_file()
-            return
-        
-        elif command == 'init':
-            initializer = FirebaseInitializer()
-            
-            print("=== Firebase 初始化 ===")
-            
-            # 初始化應用程式
-            if not initializer.initialize_app():
-                return
-            
-            # 測試連線
-            if not initializer.test_connection():
-                return
-            
-            # 建立索引配置
-            initializer.create_indexes()
-            
-            # 建立安全規則
-            initializer.create_security_rules()
-            
-            # 建立範例資料
-            if input("\n是否建立範例資料? (y/N): ").lower() == 'y':
-                initializer.create_sample_data()
-            
-            print("\n🎉 Firebase 初始化完成！")
-            print("接下來請執行:")
-            print("  firebase deploy --only firestore:indexes,firestore:rules")
-            print("  python firebase_sync.py")
-            
-        elif command == 'test':
-            initializer = FirebaseInitializer()
-            if initializer.initialize_app():
-                initializer.test_connection()
-        
-        else:
-            print_usage()
-    else:
-        print_usage()
+    command = sys.argv[1] if len(sys.argv) > 1 else None
+    COMMANDS.get(command, print_usage)()
 
 def print_usage():
     """顯示使用說明"""
     print("Firebase 初始化工具")
     print("使用方法:")
     print("  python firebase/init_firebase.py config  # 建立配置檔案")
+    print("    (可用環境變數 FIREBASE_PROJECT_ID、FIREBASE_SERVICE_ACCOUNT_KEY_PATH 略過輸入)")
     print("  python firebase/init_firebase.py init    # 初始化 Firebase")
     print("  python firebase/init_firebase.py test    # 測試連線")
 
+# 子指令對應的處理函數
+COMMANDS = {
+    'config': create_config_file,
+    'init': _run_init,
+    'test': _run_test,
+}
+
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -5,24 +5,36 @@ Firebase Firestore 資料同步腳本
 將爬取的 JSON 資料同步到 Firebase Firestore 資料庫
 """
 
+import hashlib
 import json
 import os
+import re
 import logging
-import time
-from datetime import datetime
-from typing import Dict, List, Any, Optional
+from datetime import datetime, timezone
+from typing import AbstractSet, Dict, Iterable, Iterator, List, Any, Optional
 from dataclasses import dataclass
 import concurrent.futures
+from collections import Counter
+from itertools import islice
 from threading import Lock
 
 try:
     import firebase_admin
     from firebase_admin import credentials, firestore
     from google.cloud.firestore_v1.batch import WriteBatch
+    from google.cloud.firestore_v1.bulk_writer import BulkRetry, BulkWriterOptions
+    from google.api_core import retry
+    from google.api_core.exceptions import Aborted, DeadlineExceeded, InternalServerError, ServiceUnavailable
+    from google.rpc import code_pb2
 except ImportError:
     print("請先安裝 Firebase Admin SDK: pip install firebase-admin")
     exit(1)
 
+try:
+    import orjson
+except ImportError:  # 未安裝時退回標準函式庫 json
+    orjson = None
+
 # 設定日誌
 os.makedirs('logs', exist_ok=True)
 logging.basicConfig(
@@ -35,29 +47,141 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Tips的遊戲概念關鍵字；同步時寫入 keywords 陣列，查詢端可用 array_contains 走索引
+TIP_KEYWORDS = ('職業', '法術', '護符', '從者', '進化', '職业', '法术', '护符', '从者')
+
+# 參考資料來源欄位、對應集合與顯示名稱
+REFERENCE_COLLECTIONS = (
+    ('card_set_names', 'cardSets', '卡包'),
+    ('tribe_names', 'tribes', '種族'),
+    ('skill_names', 'skills', '技能'),
+)
+
+# BulkWriter 單一寫入失敗時的最大嘗試次數 (重試間隔由 BulkRetry.exponential 指數退避)
+BULK_WRITE_MAX_ATTEMPTS = 5
+
+# BulkWriter 只重試暫時性錯誤；INVALID_ARGUMENT、PERMISSION_DENIED、NOT_FOUND 等重試也不會成功
+BULK_RETRYABLE_CODES = frozenset((
+    code_pb2.UNAVAILABLE,
+    code_pb2.ABORTED,
+    code_pb2.DEADLINE_EXCEEDED,
+    code_pb2.RESOURCE_EXHAUSTED,
+    code_pb2.INTERNAL,
+))
+
+# Firestore 單一批次寫入的操作上限
+MAX_BATCH_WRITES = 500
+
+# 非 BulkWriter 的寫入 (Tips 批次、卡片排序) 遇到暫時性錯誤時以指數退避重試
+WRITE_RETRY = retry.Retry(
+    predicate=retry.if_exception_type(ServiceUnavailable, DeadlineExceeded, Aborted, InternalServerError),
+    initial=1.0,
+    maximum=30.0,
+    multiplier=2.0,
+    deadline=120.0
+)
+
+# Tips 文檔ID的標題清理規則
+_RE_CLEAN = re.compile(r'[^\w\u4e00-\u9fff\s\-_]')
+_RE_WS = re.compile(r'\s+')
+_RE_UNDER = re.compile(r'_+')
+
+# 卡片共通數值欄位：(Firestore 欄位, JSON 欄位)，值為 None 時不寫入
+CARD_STAT_FIELDS = (
+    ('baseCardId', 'base_card_id'),
+    ('cardResourceId', 'card_resource_id'),
+    ('cardSetId', 'card_set_id'),
+    ('type', 'type'),
+    ('class', 'class'),
+    ('cost', 'cost'),
+    ('atk', 'atk'),
+    ('life', 'life'),
+    ('rarity', 'rarity'),
+)
+
+# 卡片描述欄位：(Firestore 欄位, JSON 欄位)，任一有值時寫入整組描述
+DESCRIPTION_FIELDS = (
+    ('flavourText', 'flavour_text'),
+    ('skillText', 'skill_text'),
+    ('cv', 'cv'),
+    ('illustrator', 'illustrator'),
+)
+
+def chunked(iterable: Iterable, size: int) -> Iterator[List]:
+    """將可迭代物件依序切成每份最多 size 個元素的列表，不需先轉成完整列表"""
+    iterator = iter(iterable)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+def read_file_bytes(file_path: str) -> bytes:
+    """讀取檔案原始 bytes"""
+    with open(file_path, 'rb') as f:
+        return f.read()
+
+def parse_json_bytes(raw: bytes) -> Any:
+    """解析 JSON bytes；有 orjson 時使用 orjson"""
+    return orjson.loads(raw) if orjson is not None else json.loads(raw)
+
+def load_json_file(file_path: str) -> Any:
+    """讀取 JSON 檔案；有 orjson 時直接解析原始 bytes"""
+    return parse_json_bytes(read_file_bytes(file_path))
+
 @dataclass
 class FirebaseConfig:
     """Firebase 配置"""
     project_id: str
     service_account_key_path: str
+    # 卡片同步的批次大小與執行緒數，未設定時使用 ShadowverseFirebaseSync 的預設值
+    sync_batch_size: Optional[int] = None
+    sync_max_workers: Optional[int] = None
 
 class ShadowverseFirebaseSync:
     """Shadowverse Firebase 同步器"""
     
+    # 每個工作批次的卡片數 (也是進度日誌的間隔)；卡片寫入由 BulkWriter 自行分批送出
+    BATCH_SIZE = 50
+    # 準備卡片的執行緒數：卡片準備受 GIL 限制，排入寫入也需取得 bulk_writer_lock，
+    # 只有問答變更的卡片會在工作執行緒中發出 RPC，少量執行緒即足以重疊這些等待
+    MAX_WORKERS = 8
+    # 風格變體文件沒有語言欄位，各語言的 style_card_list 會互相覆蓋，因此預設不同步
+    SYNC_STYLES = False
+    
     def __init__(self, config: FirebaseConfig):
         self.config = config
+        if config.sync_batch_size:
+            self.BATCH_SIZE = config.sync_batch_size
+        if config.sync_max_workers:
+            self.MAX_WORKERS = config.sync_max_workers
         self.app = None
         self.db = None
+        self.reset_stats()
+        # 本次執行寫入的 updatedAt/createdAt 共用同一個用戶端時間戳，
+        # 不必在每筆寫入附加 SERVER_TIMESTAMP 轉換；同步記錄仍使用伺服器時間
+        self.run_timestamp = datetime.now(timezone.utc)
+        self.stats_lock = Lock()
+        self.bulk_writer = None
+        self.bulk_writer_lock = Lock()
+        # BulkWriter 中尚未完成的卡片寫入：文件路徑 -> (卡片ID, 寫入前是否已存在)
+        self._pending_cards = {}
+        # 本次執行中已寫入共通欄位的卡片ID；同一同步器之後的語言只需寫入語言相關欄位
+        self.synced_card_ids = set()
+        # 執行開始時一次讀取的現有卡片內容雜湊：卡片ID -> {語言: 雜湊}；讀取失敗時為 None
+        self._existing_card_hashes = None
+        # 既有 Tips 文件ID，於第一次同步 Tips 時一次讀取
+        self._existing_tip_ids = None
+        self._initialize_firebase()
+    
+    def reset_stats(self):
+        """重設同步統計 (同一個同步器依序處理多個語言時，於每個語言開始前呼叫)"""
         self.stats = {
             'total_cards': 0,
             'successful_cards': 0,
             'failed_cards': 0,
             'inserted': 0,
             'updated': 0,
+            'unchanged': 0,
             'errors': []
         }
-        self.stats_lock = Lock()
-        self._initialize_firebase()
     
     def _initialize_firebase(self):
         """初始化 Firebase"""
@@ -78,8 +202,15 @@ class ShadowverseFirebaseSync:
             logger.error(f"✗ Firebase 初始化失敗: {e}")
             raise
     
-    def sync_language_data(self, language: str, json_file_path: str) -> bool:
-        """同步單一語言的資料"""
+    def sync_language_data(self, language: str, json_file_path: str,
+                           reference_names: Optional[Dict[str, Dict[str, Dict[str, str]]]] = None,
+                           preloaded: Optional[concurrent.futures.Future] = None) -> bool:
+        """同步單一語言的資料
+        
+        傳入 reference_names 時不直接寫入參考資料，而是累積到該字典，
+        由呼叫端收集完所有語言後以 sync_reference_names 一次寫入；
+        傳入 preloaded 時使用呼叫端已在背景讀取的檔案內容 (bytes)
+        """
         logger.info(f"開始同步 {language} 語言資料...")
         
         # 記錄同步開始
@@ -87,17 +218,26 @@ class ShadowverseFirebaseSync:
         
         try:
             # 讀取 JSON 資料
-            with open(json_file_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            raw = preloaded.result() if preloaded is not None else read_file_bytes(json_file_path)
+            data = parse_json_bytes(raw)
             
             card_data = data.get('data', {})
             
-            # 同步基礎資料 (卡包、種族、技能)
-            self._sync_reference_data(card_data, language)
-            
-            # 同步卡片資料
-            sort_card_id_list = card_data.get('sort_card_id_list', [])
-            self._sync_cards_data(card_data, language, sort_card_id_list)
+            # 參考資料與卡片共用同一個 BulkWriter，由 SDK 負責分批、平行送出與重試
+            self._open_bulk_writer()
+            try:
+                # 同步基礎資料 (卡包、種族、技能)
+                if reference_names is None:
+                    self._sync_reference_data(card_data, language)
+                else:
+                    self._collect_reference_names(card_data, language, reference_names)
+                
+                # 同步卡片資料
+                sort_card_id_list = card_data.get('sort_card_id_list', [])
+                self._sync_cards_data(card_data, language, sort_card_id_list)
+            finally:
+                # 等待所有寫入完成，統計資料在此之後才完整
+                self._close_bulk_writer()
             
             # 同步卡片排序資料
             if 'sort_card_id_list' in card_data:
@@ -114,6 +254,59 @@ class ShadowverseFirebaseSync:
             self._update_sync_log(sync_log_ref, 'failed', str(e))
             return False
     
+    def _open_bulk_writer(self):
+        """建立 BulkWriter 並註冊寫入結果回呼"""
+        self.bulk_writer = self.db.bulk_writer(options=BulkWriterOptions(retry=BulkRetry.exponential))
+        self.bulk_writer.on_write_result(self._on_bulk_write_result)
+        self.bulk_writer.on_write_error(self._on_bulk_write_error)
+    
+    def _close_bulk_writer(self):
+        """送出剩餘寫入並關閉 BulkWriter"""
+        if self.bulk_writer is not None:
+            self.bulk_writer.close()
+            self.bulk_writer = None
+    
+    def _bulk_set(self, doc_ref, data: Dict, merge: bool = False):
+        """透過 BulkWriter 排入一筆寫入 (BulkWriter 非執行緒安全，以鎖保護排入動作)"""
+        with self.bulk_writer_lock:
+            self.bulk_writer.set(doc_ref, data, merge=merge)
+    
+    def _bulk_delete(self, doc_ref):
+        """透過 BulkWriter 排入一筆刪除"""
+        with self.bulk_writer_lock:
+            self.bulk_writer.delete(doc_ref)
+    
+    def _on_bulk_write_result(self, doc_ref, result, bulk_writer):
+        """單筆寫入成功：更新卡片統計"""
+        with self.stats_lock:
+            pending = self._pending_cards.pop(doc_ref.path, None)
+            if pending is None:
+                return
+            card_id, exists = pending
+            self.synced_card_ids.add(card_id)
+            if exists:
+                self.stats['updated'] += 1
+            elif exists is False:
+                self.stats['inserted'] += 1
+            self.stats['successful_cards'] += 1
+    
+    def _on_bulk_write_error(self, error, bulk_writer) -> bool:
+        """單筆寫入失敗：暫時性錯誤且未達上限時回傳 True 重試，否則記錄失敗"""
+        if error.code in BULK_RETRYABLE_CODES and error.attempts < BULK_WRITE_MAX_ATTEMPTS:
+            return True
+        
+        doc_path = error.operation.reference.path
+        logger.error(f"寫入 {doc_path} 失敗: {error.message}")
+        with self.stats_lock:
+            pending = self._pending_cards.pop(doc_path, None)
+            if pending is not None:
+                card_id, _ = pending
+                self.stats['failed_cards'] += 1
+                self.stats['errors'].append(f"Card {card_id}: {error.message}")
+            else:
+                self.stats['errors'].append(f"{doc_path}: {error.message}")
+        return False
+    
     def _create_sync_log(self, language: str) -> firestore.DocumentReference:
         """建立同步記錄"""
         try:
@@ -159,110 +352,48 @@ class ShadowverseFirebaseSync:
         """同步參考資料 (卡包、種族、技能)"""
         logger.info(f"同步 {language} 參考資料...")
         
-        # 同步卡包資料
-        if 'card_set_names' in card_data:
-            self._sync_card_sets(card_data['card_set_names'], language)
-        
-        # 同步種族資料
-        if 'tribe_names' in card_data:
-            self._sync_tribes(card_data['tribe_names'], language)
-        
-        # 同步技能資料
-        if 'skill_names' in card_data:
-            self._sync_skills(card_data['skill_names'], language)
+        reference_names = {}
+        self._collect_reference_names(card_data, language, reference_names)
+        self._sync_reference_names(reference_names)
     
-    def _sync_card_sets(self, card_sets: Dict[str, str], language: str):
-        """同步卡包資料"""
-        batch = self.db.batch()
-        batch_count = 0
-        
-        for set_id, set_name in card_sets.items():
-            try:
-                set_ref = self.db.collection('cardSets').document(str(set_id))
-                
-                # 使用 merge=True 來更新或建立文件
-                batch.set(set_ref, {
-                    'id': int(set_id),
-                    f'names.{language}': set_name,
-                    'updatedAt': firestore.SERVER_TIMESTAMP
-                }, merge=True)
-                
-                batch_count += 1
-                
-                # 每 500 個操作提交一次批次
-                if batch_count >= 500:
-                    batch.commit()
-                    batch = self.db.batch()
-                    batch_count = 0
-                    
-            except Exception as e:
-                logger.error(f"同步卡包 {set_id} 失敗: {e}")
-        
-        # 提交剩餘的批次操作
-        if batch_count > 0:
-            batch.commit()
-        
-        logger.info(f"同步了 {len(card_sets)} 個卡包")
+    def _collect_reference_names(self, card_data: Dict, language: str,
+                                 reference_names: Dict[str, Dict[str, Dict[str, str]]]):
+        """將參考資料名稱累積為 {集合: {ID: {語言: 名稱}}}"""
+        for source_key, collection, _ in REFERENCE_COLLECTIONS:
+            items = reference_names.setdefault(collection, {})
+            for item_id, name in card_data.get(source_key, {}).items():
+                items.setdefault(item_id, {})[language] = name
     
-    def _sync_tribes(self, tribes: Dict[str, str], language: str):
-        """同步種族資料"""
-        batch = self.db.batch()
-        batch_count = 0
-        
-        for tribe_id, tribe_name in tribes.items():
-            try:
-                tribe_ref = self.db.collection('tribes').document(str(tribe_id))
-                
-                batch.set(tribe_ref, {
-                    'id': int(tribe_id),
-                    f'names.{language}': tribe_name,
-                    'updatedAt': firestore.SERVER_TIMESTAMP
-                }, merge=True)
-                
-                batch_count += 1
-                
-                if batch_count >= 500:
-                    batch.commit()
-                    batch = self.db.batch()
-                    batch_count = 0
-                    
-            except Exception as e:
-                logger.error(f"同步種族 {tribe_id} 失敗: {e}")
+    def sync_reference_names(self, reference_names: Dict[str, Dict[str, Dict[str, str]]]):
+        """以獨立的 BulkWriter 寫入已累積的多語言參考資料"""
+        logger.info("同步參考資料 (卡包、種族、技能)...")
         
-        if batch_count > 0:
-            batch.commit()
-        
-        logger.info(f"同步了 {len(tribes)} 個種族")
+        self._open_bulk_writer()
+        try:
+            self._sync_reference_names(reference_names)
+        finally:
+            self._close_bulk_writer()
     
-    def _sync_skills(self, skills: Dict[str, str], language: str):
-        """同步技能資料"""
-        batch = self.db.batch()
-        batch_count = 0
-        
-        for skill_id, skill_name in skills.items():
-            try:
-                skill_ref = self.db.collection('skills').document(str(skill_id))
-                
-                batch.set(skill_ref, {
-                    'id': int(skill_id),
-                    f'names.{language}': skill_name,
-                    'updatedAt': firestore.SERVER_TIMESTAMP
-                }, merge=True)
-                
-                batch_count += 1
-                
-                if batch_count >= 500:
-                    batch.commit()
-                    batch = self.db.batch()
-                    batch_count = 0
+    def _sync_reference_names(self, reference_names: Dict[str, Dict[str, Dict[str, str]]]):
+        """每個參考資料文件只寫入一次，names 為包含所有語言的巢狀 map"""
+        for _, collection, label in REFERENCE_COLLECTIONS:
+            items = reference_names.get(collection, {})
+            
+            for item_id, names in items.items():
+                try:
+                    item_ref = self.db.collection(collection).document(item_id)
                     
-            except Exception as e:
-                logger.error(f"同步技能 {skill_id} 失敗: {e}")
-        
-        if batch_count > 0:
-            batch.commit()
-        
-        logger.info(f"同步了 {len(skills)} 個技能")
+                    # 使用 merge=True 來更新或建立文件，未包含的語言保持不變
+                    self._bulk_set(item_ref, {
+                        'id': int(item_id),
+                        'names': names,
+                        'updatedAt': self.run_timestamp
+                    }, merge=True)
+                    
+                except Exception as e:
+                    logger.error(f"同步{label} {item_id} 失敗: {e}")
+            
+            logger.info(f"同步了 {len(items)} 個{label}")
 
     def _sync_card_sort_order(self, sort_card_id_list: List[int], language: str):
         """同步卡片排序資料"""
@@ -276,37 +407,36 @@ class ShadowverseFirebaseSync:
                 'language': language,
                 'cardIds': sort_card_id_list,
                 'totalCards': len(sort_card_id_list),
-                'updatedAt': firestore.SERVER_TIMESTAMP
+                'updatedAt': self.run_timestamp
             }
             
             # 檢查是否已存在
             existing_doc = sort_order_ref.get()
             if existing_doc.exists:
                 # 更新現有文檔
-                sort_order_ref.update(sort_data)
+                sort_order_ref.update(sort_data, retry=WRITE_RETRY)
                 logger.info(f"更新了 {language} 語言的卡片排序資料 ({len(sort_card_id_list)} 張卡片)")
             else:
                 # 建立新文檔
-                sort_data['createdAt'] = firestore.SERVER_TIMESTAMP
-                sort_order_ref.set(sort_data)
+                sort_data['createdAt'] = self.run_timestamp
+                sort_order_ref.set(sort_data, retry=WRITE_RETRY)
                 logger.info(f"建立了 {language} 語言的卡片排序資料 ({len(sort_card_id_list)} 張卡片)")
             
         except Exception as e:
             logger.error(f"同步 {language} 卡片排序資料失敗: {e}")
             self.stats['errors'].append(f"同步卡片排序失敗: {str(e)}")
 
-    def _generate_tip_doc_id(self, title: str, language: str, index: int) -> str:
-        """生成改進的 tip 文檔ID"""
-        import re
-        
+    @staticmethod
+    def _clean_tip_title(title: str) -> str:
+        """清理並截斷 Tips 標題，作為文檔ID的一部分"""
         # 1. 清理標題，只保留字母、數字、中文字符和基本標點
-        cleaned_title = re.sub(r'[^\w\u4e00-\u9fff\s\-_]', '', title)
+        cleaned_title = _RE_CLEAN.sub('', title)
         
         # 2. 將多個空格替換為單個下劃線
-        cleaned_title = re.sub(r'\s+', '_', cleaned_title.strip())
+        cleaned_title = _RE_WS.sub('_', cleaned_title.strip())
         
         # 3. 移除連續的下劃線
-        cleaned_title = re.sub(r'_+', '_', cleaned_title)
+        cleaned_title = _RE_UNDER.sub('_', cleaned_title)
         
         # 4. 限制長度，避免過長的文檔ID
         max_title_length = 30
@@ -320,45 +450,16 @@ class ShadowverseFirebaseSync:
                 truncated = truncated[:-1]
             cleaned_title = truncated
         
-        # 5. 生成最終的文檔ID: 序號_標題_語言
-        # 使用3位數字前綴確保排序
-        doc_id = f"{index:03d}_{cleaned_title}_{language}"
-        
-        # 6. 最終清理，確保沒有以下劃線開始或結束
-        doc_id = doc_id.strip('_')
-        
-        return doc_id
+        return cleaned_title
+    
+    def _generate_tip_doc_id(self, title: str, language: str, index: int) -> str:
+        """生成改進的 tip 文檔ID: 序號_標題_語言"""
+        # 使用3位數字前綴確保排序，並確保沒有以下劃線開始或結束
+        return f"{index:03d}_{self._clean_tip_title(title)}_{language}".strip('_')
 
     def _generate_base_tip_doc_id(self, title: str, index: int) -> str:
-        """生成基礎 tip 文檔ID（不包含語言後綴，用於多語言合併）"""
-        import re
-        
-        # 1. 清理標題，只保留字母、數字、中文字符和基本標點
-        cleaned_title = re.sub(r'[^\w\u4e00-\u9fff\s\-_]', '', title)
-        
-        # 2. 將多個空格替換為單個下劃線
-        cleaned_title = re.sub(r'\s+', '_', cleaned_title.strip())
-        
-        # 3. 移除連續的下劃線
-        cleaned_title = re.sub(r'_+', '_', cleaned_title)
-        
-        # 4. 限制長度
-        max_title_length = 30
-        if len(cleaned_title) > max_title_length:
-            truncated = cleaned_title[:max_title_length]
-            while len(truncated) > 0 and ord(truncated[-1]) > 127:
-                if len(truncated) < max_title_length:
-                    break
-                truncated = truncated[:-1]
-            cleaned_title = truncated
-        
-        # 5. 生成基礎文檔ID: 序號_標題（不包含語言）
-        doc_id = f"{index:03d}_{cleaned_title}"
-        
-        # 6. 最終清理
-        doc_id = doc_id.strip('_')
-        
-        return doc_id
+        """生成基礎 tip 文檔ID（不包含語言後綴，用於多語言合併）: 序號_標題"""
+        return f"{index:03d}_{self._clean_tip_title(title)}".strip('_')
 
     def _sync_tips_data(self, tips_data: List[Dict], language: str):
         """同步Tips資料到Firebase"""
@@ -369,6 +470,11 @@ class ShadowverseFirebaseSync:
             batch = self.db.batch()
             batch_count = 0
             
+            # 一次掃描取得所有既有 Tips 文件ID (不讀取欄位)，取代逐筆讀取；
+            # 之後新建的文件也加入此集合，讓後續語言改用 update 合併
+            if self._existing_tip_ids is None:
+                self._existing_tip_ids = {doc.id for doc in tips_ref.select([]).stream()}
+            
             for index, tip in enumerate(tips_data, 1):
                 title = tip.get('title', '').strip()
                 desc = tip.get('desc', '').strip()
@@ -376,54 +482,43 @@ class ShadowverseFirebaseSync:
                 if not title or not desc:
                     continue
                 
-                # 改進的文檔ID命名方法
-                doc_id = self._generate_tip_doc_id(title, language, index)
-                
-                # 檢查是否已存在相同標題的文檔（不同語言版本）
-                base_doc_id = self._generate_base_tip_doc_id(title, index)
-                existing_doc = None
-                
-                # 先嘗試找到基礎文檔ID
-                try:
-                    existing_doc = tips_ref.document(base_doc_id).get()
-                except:
-                    # 如果基礎文檔不存在，嘗試當前語言的文檔ID
-                    try:
-                        existing_doc = tips_ref.document(doc_id).get()
-                    except:
-                        pass
-                
                 # 使用基礎文檔ID（不包含語言後綴）來合併多語言
-                final_doc_id = base_doc_id
+                final_doc_id = self._generate_base_tip_doc_id(title, index)
                 
                 tip_data = {
                     f'title.{language}': title,
                     f'desc.{language}': desc,
-                    'updatedAt': firestore.SERVER_TIMESTAMP,
+                    'updatedAt': self.run_timestamp,
                     'index': index  # 添加索引用於排序
                 }
                 
-                if existing_doc and existing_doc.exists:
-                    # 更新現有文檔
-                    batch.update(tips_ref.document(final_doc_id), tip_data)
+                keywords = [kw for kw in TIP_KEYWORDS if kw in title or kw in desc]
+                if keywords:
+                    # 各語言的關鍵字累加到同一個陣列
+                    tip_data['keywords'] = firestore.ArrayUnion(keywords)
+                
+                if final_doc_id in self._existing_tip_ids:
                     self.stats['updated'] += 1
                 else:
-                    # 建立新文檔
-                    tip_data['createdAt'] = firestore.SERVER_TIMESTAMP
-                    batch.set(tips_ref.document(final_doc_id), tip_data)
+                    # 新文檔才寫入 createdAt，避免之後的同步覆蓋建立時間
+                    tip_data['createdAt'] = self.run_timestamp
+                    self._existing_tip_ids.add(final_doc_id)
                     self.stats['inserted'] += 1
                 
+                # 新建與更新都以 merge 寫入：文件不存在時不會失敗，各語言的欄位互不覆蓋
+                batch.set(tips_ref.document(final_doc_id), tip_data, merge=True)
+                
                 batch_count += 1
                 
                 # 每500個操作提交一次批次
                 if batch_count >= 500:
-                    batch.commit()
+                    batch.commit(retry=WRITE_RETRY)
                     batch = self.db.batch()
                     batch_count = 0
             
             # 提交剩餘的批次
             if batch_count > 0:
-                batch.commit()
+                batch.commit(retry=WRITE_RETRY)
             
             logger.info(f"同步了 {len(tips_data)} 個Tips")
             
@@ -439,112 +534,183 @@ class ShadowverseFirebaseSync:
         
         card_details = card_data['card_details']
         self.stats['total_cards'] = len(card_details)
+        # 轉為集合，判斷 relatedOnly 時不必對每張卡線性搜尋整個排序列表
+        sort_card_ids = frozenset(sort_card_id_list)
+        
+        # 各語言共用同一份現況：之後語言新建的卡片已記錄在 synced_card_ids
+        if self._existing_card_hashes is None:
+            self._existing_card_hashes = self._load_existing_card_hashes()
         
         logger.info(f"開始同步 {self.stats['total_cards']} 張卡片...")
         
         # 使用多執行緒同步卡片
-        card_ids = list(card_details.keys())
-        batch_size = 20  # 每批處理的卡片數量
+        total_cards = len(card_details)
+        batch_size = self.BATCH_SIZE
         
-        with concurrent.futures.ThreadPoolExecutor(max_workers=5) as executor:
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self.MAX_WORKERS) as executor:
             futures = []
             
-            for i in range(0, len(card_ids), batch_size):
-                batch_ids = card_ids[i:i + batch_size]
+            for batch_ids in chunked(card_details, batch_size):
                 future = executor.submit(
                     self._sync_card_batch, 
                     batch_ids, 
                     card_details, 
                     language,
-                    sort_card_id_list
+                    sort_card_ids,
+                    self._existing_card_hashes
                 )
                 futures.append(future)
             
             # 等待所有批次完成
             for i, future in enumerate(concurrent.futures.as_completed(futures)):
                 try:
-                    future.result()
-                    progress = min((i + 1) * batch_size, len(card_ids))
-                    logger.info(f"已處理 {progress}/{len(card_ids)} 張卡片")
+                    batch_stats = future.result()
+                    # 在主執行緒彙總各批次的本地統計 (BulkWriter 回呼仍以 stats_lock 更新寫入結果)
+                    with self.stats_lock:
+                        self.stats['unchanged'] += batch_stats['unchanged']
+                        self.stats['successful_cards'] += batch_stats['unchanged']
+                        self.stats['failed_cards'] += batch_stats['failed']
+                        self.stats['errors'].extend(batch_stats['errors'])
+                    self.synced_card_ids.update(batch_stats['unchanged_ids'])
+                    progress = min((i + 1) * batch_size, total_cards)
+                    # 每批次都會執行，使用延遲格式化，日誌層級關閉時不組字串
+                    logger.info("已處理 %d/%d 張卡片", progress, total_cards)
                 except Exception as e:
                     logger.error(f"批次處理失敗: {e}")
     
-    def _sync_card_batch(self, card_ids: List[str], card_details: Dict, language: str, sort_card_id_list: List[int]):
-        """同步一批卡片"""
-        batch = self.db.batch()
-        
+    def _load_existing_card_hashes(self) -> Optional[Dict[str, Dict[str, Dict[str, str]]]]:
+        """以單一串流查詢讀取所有卡片文件的 contentHashes 與 questionsHashes 欄位，取代逐張或逐批讀取"""
+        try:
+            existing = {
+                snapshot.id: snapshot.to_dict() or {}
+                for snapshot in self.db.collection('cards').select(['contentHashes', 'questionsHashes']).stream()
+            }
+            logger.info(f"讀取了 {len(existing)} 張現有卡片的內容雜湊")
+            return existing
+        except Exception as e:
+            # 無法讀取時不略過任何卡片，並使用merge模式
+            logger.warning(f"無法讀取現有卡片，使用merge模式: {e}")
+            return None
+    
+    def _sync_card_batch(self, card_ids: List[str], card_details: Dict, language: str,
+                         sort_card_ids: AbstractSet[int],
+                         existing_hashes: Optional[Dict[str, Dict[str, Dict[str, str]]]]) -> Dict[str, Any]:
+        """準備一批卡片並排入 BulkWriter；內容雜湊未變的卡片直接略過
+        
+        寫入結果由 BulkWriter 回呼更新統計；批次內的略過與失敗累積在本地統計中回傳，
+        由 _sync_cards_data 在主執行緒彙總，不需取得鎖
+        """
+        local_stats = {'unchanged': 0, 'failed': 0, 'errors': [], 'unchanged_ids': []}
         for card_id in card_ids:
+            card_ref = None
             try:
                 card_info = card_details[card_id]
-                card_data = self._prepare_card_data(card_id, card_info, language, sort_card_id_list)
+                # JSON 物件的鍵本身就是字串，可直接作為文件ID
+                card_ref = self.db.collection('cards').document(card_id)
                 
-                card_ref = self.db.collection('cards').document(str(card_id))
+                # 其他語言已在本次執行寫入共通欄位時，只需合併語言相關欄位
+                include_invariant = card_id not in self.synced_card_ids
+                card_data = self._prepare_card_data(card_id, card_info, language, sort_card_ids,
+                                                    include_invariant=include_invariant)
+                content_hash = self._content_hash(card_data)
+                card_data['contentHashes'] = {language: content_hash}
                 
-                # 檢查卡片是否已存在來決定是插入還是更新
-                try:
-                    existing_doc = card_ref.get()
-                    if existing_doc.exists:
-                        # 更新現有卡片
-                        batch.set(card_ref, card_data, merge=True)
-                        with self.stats_lock:
-                            self.stats['updated'] += 1
-                    else:
-                        # 插入新卡片
-                        batch.set(card_ref, card_data)
-                        with self.stats_lock:
-                            self.stats['inserted'] += 1
-                except Exception as doc_check_error:
-                    # 如果無法檢查文檔存在性，默認使用merge模式
-                    logger.warning(f"無法檢查卡片 {card_id} 是否存在，使用merge模式: {doc_check_error}")
-                    batch.set(card_ref, card_data, merge=True)
+                # 存在與否與已儲存的雜湊都來自執行開始時的預先讀取，不需逐張讀取
+                if existing_hashes is None:
+                    stored = None
+                    exists = None if include_invariant else True
+                else:
+                    stored = existing_hashes.get(card_id)
+                    exists = stored is not None or not include_invariant
+                stored = stored or {}
+                
+                # 問答子集合另以問答雜湊判斷，與卡片本身是否變更無關
+                stored_questions_hash = (stored.get('questionsHashes') or {}).get(language)
+                questions_hash = self._sync_card_subcollections(card_id, card_info, language,
+                                                                stored_questions_hash)
+                if exists is False and questions_hash:
+                    # 新卡片以非 merge 的 set() 完整寫入，會覆蓋問答批次剛寫入的雜湊；
+                    # 問答已成功提交時一併寫入，不論 BulkWriter 何時送出都能保留
+                    card_data['questionsHashes'] = {language: questions_hash}
+                
+                if (stored.get('contentHashes') or {}).get(language) == content_hash:
+                    # 內容與已儲存版本相同，不寫入 (也不更新 updatedAt)
+                    local_stats['unchanged'] += 1
+                    local_stats['unchanged_ids'].append(card_id)
+                    continue
+                
+                # 必須在排入寫入前登記，回呼才找得到；單一字典賦值在 GIL 下為原子操作
+                self._pending_cards[card_ref.path] = (card_id, exists)
                 
-                with self.stats_lock:
-                    self.stats['successful_cards'] += 1
+                # 新卡片完整寫入，既有 (或無法確認) 的卡片使用 merge 模式
+                self._bulk_set(card_ref, card_data, merge=exists is not False)
                     
             except Exception as e:
                 logger.error(f"準備卡片 {card_id} 資料失敗: {e}")
-                with self.stats_lock:
-                    self.stats['failed_cards'] += 1
-                    self.stats['errors'].append(f"Card {card_id}: {str(e)}")
+                if card_ref is not None:
+                    self._pending_cards.pop(card_ref.path, None)
+                local_stats['failed'] += 1
+                local_stats['errors'].append(f"Card {card_id}: {str(e)}")
         
-        # 提交批次
-        try:
-            batch.commit()
-        except Exception as e:
-            logger.error(f"提交批次失敗: {e}")
-            with self.stats_lock:
-                self.stats['failed_cards'] += len(card_ids)
+        return local_stats
     
-    def _prepare_card_data(self, card_id: str, card_info: Dict, language: str, sort_card_id_list: List[int]) -> Dict:
-        """準備卡片資料"""
+    @staticmethod
+    def _content_hash(card_data: Dict[str, Any]) -> str:
+        """計算卡片內容雜湊 (排除 updatedAt 時間戳)，用於判斷內容是否變更"""
+        content = {key: value for key, value in card_data.items() if key != 'updatedAt'}
+        encoded = json.dumps(content, sort_keys=True, ensure_ascii=False, default=str).encode('utf-8')
+        return hashlib.blake2b(encoded, digest_size=16).hexdigest()
+    
+    def _prepare_card_data(self, card_id: str, card_info: Dict, language: str, sort_card_ids: AbstractSet[int],
+                           include_invariant: bool = True) -> Dict:
+        """準備卡片資料 (include_invariant=False 時只包含與語言相關的欄位)"""
+        card_id_int = int(card_id)
+        card_data = self._prepare_card_localized(card_id_int, card_info, language, sort_card_ids)
+        if include_invariant:
+            card_data.update(self._prepare_card_invariant(card_id_int, card_info))
+        return card_data
+    
+    def _prepare_card_invariant(self, card_id_int: int, card_info: Dict) -> Dict:
+        """準備各語言共通的卡片欄位 (數值、種族、相關卡片)"""
         common = card_info.get('common', {})
-        evo = card_info.get('evo', {})
         
-        # 檢查卡牌是否在 sort_card_id_list 中，如果不在則標記為 relatedOnly
-        card_id_int = int(card_id)
-        related_only = card_id_int not in sort_card_id_list
+        # 基本卡片資料 (略過 None 值)
+        card_data = {'id': card_id_int}
+        for field, key in CARD_STAT_FIELDS:
+            if (value := common.get(key)) is not None:
+                card_data[field] = value
+        card_data['isToken'] = common.get('is_token', False)
+        card_data['isIncludeRotation'] = common.get('is_include_rotation', False)
         
-        # 基本卡片資料
+        # 種族資訊
+        if 'tribes' in common and common['tribes']:
+            # 過濾掉 0 (無種族)
+            tribes = [t for t in common['tribes'] if t != 0]
+            if tribes:
+                card_data['tribes'] = tribes
+        
+        # 相關卡片
+        if 'related_cards' in card_info and card_info['related_cards']:
+            card_data['relatedCards'] = card_info['related_cards']
+        
+        # 特效相關卡片
+        if 'specific_effect_cards' in card_info and card_info['specific_effect_cards']:
+            card_data['specificEffectCards'] = card_info['specific_effect_cards']
+        
+        return card_data
+    
+    def _prepare_card_localized(self, card_id_int: int, card_info: Dict, language: str,
+                                sort_card_ids: AbstractSet[int]) -> Dict:
+        """準備與語言相關的卡片欄位 (名稱、圖片、描述、進化資訊等)"""
+        common = card_info.get('common', {})
+        evo = card_info.get('evo', {})
+        
+        # 檢查卡牌是否在排序列表中，如果不在則標記為 relatedOnly
         card_data = {
-            'id': card_id_int,
-            'baseCardId': common.get('base_card_id'),
-            'cardResourceId': common.get('card_resource_id'),
-            'cardSetId': common.get('card_set_id'),
-            'type': common.get('type'),
-            'class': common.get('class'),
-            'cost': common.get('cost'),
-            'atk': common.get('atk'),
-            'life': common.get('life'),
-            'rarity': common.get('rarity'),
-            'isToken': common.get('is_token', False),
-            'isIncludeRotation': common.get('is_include_rotation', False),
-            'relatedOnly': related_only,
-            'updatedAt': firestore.SERVER_TIMESTAMP
+            'relatedOnly': card_id_int not in sort_card_ids,
+            'updatedAt': self.run_timestamp
         }
         
-        # 移除 None 值
-        card_data = {k: v for k, v in card_data.items() if v is not None}
-        
         # 多語言名稱
         if common.get('name'):
             card_data[f'names.{language}'] = {
@@ -563,23 +729,15 @@ class ShadowverseFirebaseSync:
                 card_data[f'images.{language}'] = image_data
         
         # 多語言描述 (普通形態)
-        if any([common.get('flavour_text'), common.get('skill_text'), 
-                common.get('cv'), common.get('illustrator')]):
+        if any(common.get(key) for _, key in DESCRIPTION_FIELDS):
             card_data[f'descriptions.{language}.common'] = {
-                'flavourText': common.get('flavour_text', ''),
-                'skillText': common.get('skill_text', ''),
-                'cv': common.get('cv', ''),
-                'illustrator': common.get('illustrator', '')
+                field: common.get(key, '') for field, key in DESCRIPTION_FIELDS
             }
         
         # 多語言描述 (進化形態)
-        if evo and any([evo.get('flavour_text'), evo.get('skill_text'), 
-                       evo.get('cv'), evo.get('illustrator')]):
+        if evo and any(evo.get(key) for _, key in DESCRIPTION_FIELDS):
             card_data[f'descriptions.{language}.evo'] = {
-                'flavourText': evo.get('flavour_text', ''),
-                'skillText': evo.get('skill_text', ''),
-                'cv': evo.get('cv', ''),
-                'illustrator': evo.get('illustrator', '')
+                field: evo.get(key, '') for field, key in DESCRIPTION_FIELDS
             }
         
         # 進化資訊
@@ -601,76 +759,106 @@ class ShadowverseFirebaseSync:
             if evolution_data:
                 card_data['evolution'] = evolution_data
         
-        # 種族資訊
-        if 'tribes' in common and common['tribes']:
-            # 過濾掉 0 (無種族)
-            tribes = [t for t in common['tribes'] if t != 0]
-            if tribes:
-                card_data['tribes'] = tribes
-        
-        # 相關卡片
-        if 'related_cards' in card_info and card_info['related_cards']:
-            card_data['relatedCards'] = card_info['related_cards']
-        
-        # 特效相關卡片
-        if 'specific_effect_cards' in card_info and card_info['specific_effect_cards']:
-            card_data['specificEffectCards'] = card_info['specific_effect_cards']
+        # 反正規化的問答旗標，查詢端不必逐張探測 questions 子集合
+        # 只寫入 True，避免沒有問答的語言覆蓋掉其他語言的結果
+        if common.get('questions'):
+            card_data['hasQuestions'] = True
         
         return card_data
     
-    def _sync_card_subcollections(self, card_id: str, card_info: Dict, language: str):
-        """同步卡片子集合 (問答和風格變體)"""
+    def _sync_card_subcollections(self, card_id: str, card_info: Dict, language: str,
+                                  stored_questions_hash: Optional[str] = None) -> Optional[str]:
+        """同步卡片子集合 (問答和風格變體)
+        
+        stored_questions_hash 為卡片文件上 questionsHashes.{language} 的現值；
+        與本次問答的雜湊相同時不讀取也不寫入問答子集合。
+        回傳已儲存的問答雜湊 (沒有問答或同步失敗時為 None)
+        """
+        questions_hash = None
+        
         # 同步問答
         if 'questions' in card_info.get('common', {}):
-            self._sync_card_questions(card_id, card_info['common']['questions'], language)
+            questions_hash = self._sync_card_questions(card_id, card_info['common']['questions'], language,
+                                                       stored_questions_hash)
         
         # 同步風格變體
-        if 'style_card_list' in card_info:
+        if self.SYNC_STYLES and 'style_card_list' in card_info:
             self._sync_card_styles(card_id, card_info['style_card_list'])
+        
+        return questions_hash
     
-    def _sync_card_questions(self, card_id: str, questions: List[Dict], language: str):
-        """同步卡片問答"""
+    def _sync_card_questions(self, card_id: str, questions: List[Dict], language: str,
+                             stored_hash: Optional[str] = None) -> Optional[str]:
+        """同步卡片問答
+        
+        比對現有問答與新問答，只刪除已不存在的、新增尚未存在的；
+        刪除、新增與問答雜湊在同一個批次中原子提交，任一筆失敗時雜湊不會更新，
+        下次同步會重新比對。回傳已儲存的問答雜湊，失敗時為 None
+        """
         try:
-            questions_ref = self.db.collection('cards').document(str(card_id)).collection('questions')
+            card_ref = self.db.collection('cards').document(str(card_id))
+            questions_ref = card_ref.collection('questions')
+            
+            new_rows = Counter((q.get('question', ''), q.get('answer', '')) for q in questions)
+            questions_hash = hashlib.blake2b(
+                json.dumps(sorted(new_rows.elements()), ensure_ascii=False).encode('utf-8'),
+                digest_size=16
+            ).hexdigest()
+            if questions_hash == stored_hash:
+                return questions_hash
             
-            # 先刪除該語言的現有問答
-            existing_questions = questions_ref.where('language', '==', language).get()
             batch = self.db.batch()
+            op_count = 0
             
-            for doc in existing_questions:
-                batch.delete(doc.reference)
-            
-            # 新增問答
-            for q in questions:
-                question_ref = questions_ref.document()
-                batch.set(question_ref, {
-                    'language': language,
-                    'question': q.get('question', ''),
-                    'answer': q.get('answer', ''),
-                    'createdAt': firestore.SERVER_TIMESTAMP
-                })
+            # 只讀取比對所需的欄位；與新問答相同的文件保留，其餘刪除
+            for doc in questions_ref.where('language', '==', language).select(['question', 'answer']).stream():
+                fields = doc.to_dict() or {}
+                row = (fields.get('question', ''), fields.get('answer', ''))
+                if new_rows[row] > 0:
+                    new_rows[row] -= 1
+                else:
+                    batch.delete(doc.reference)
+                    op_count += 1
+            
+            # 新增尚未存在的問答
+            for (question, answer), count in new_rows.items():
+                for _ in range(count):
+                    batch.set(questions_ref.document(), {
+                        'language': language,
+                        'question': question,
+                        'answer': answer,
+                        'createdAt': self.run_timestamp
+                    })
+                    op_count += 1
             
-            batch.commit()
+            # 加上雜湊本身的一筆寫入後超過單一批次上限時無法原子提交，不寫入任何變更
+            if op_count + 1 > MAX_BATCH_WRITES:
+                logger.error(f"卡片 {card_id} 的問答變更 ({op_count} 筆) 超過單一批次上限，略過同步")
+                return None
+            
+            # 記錄問答雜湊，下次內容相同時可直接略過
+            batch.set(card_ref, {'questionsHashes': {language: questions_hash}}, merge=True)
+            batch.commit(retry=WRITE_RETRY)
+            return questions_hash
             
         except Exception as e:
             logger.error(f"同步卡片 {card_id} 問答失敗: {e}")
+            return None
     
     def _sync_card_styles(self, card_id: str, styles: List[Dict]):
-        """同步卡片風格變體"""
+        """同步卡片風格變體 (需在 BulkWriter 開啟期間呼叫)
+        
+        以風格 hash 作為文件ID完整寫入，並刪除不在本次風格列表中的既有文件
+        (包含已移除的風格與舊版以自動ID建立的文件)
+        """
         try:
             styles_ref = self.db.collection('cards').document(str(card_id)).collection('styles')
             
-            # 先刪除現有風格
-            existing_styles = styles_ref.get()
-            batch = self.db.batch()
-            
-            for doc in existing_styles:
-                batch.delete(doc.reference)
-            
-            # 新增風格變體
-            for style in styles:
-                style_ref = styles_ref.document()
-                batch.set(style_ref, {
+            new_styles = {}
+            for index, style in enumerate(styles):
+                # 沒有 hash 的風格以其在列表中的位置作為固定ID
+                style_id = style.get('hash') or str(index)
+                new_styles[style_id] = {
                     'hash': style.get('hash', ''),
                     'evoHash': style.get('evo_hash', ''),
                     'name': style.get('name', ''),
@@ -680,10 +868,17 @@ class ShadowverseFirebaseSync:
                     'skillText': style.get('skill_text', ''),
                     'flavourText': style.get('flavour_text', ''),
                     'evoFlavourText': style.get('evo_flavour_text', ''),
-                    'createdAt': firestore.SERVER_TIMESTAMP
-                })
+                    'createdAt': self.run_timestamp
+                }
+            
+            # list_documents 只取得文件參照，不讀取內容
+            for style_doc_ref in styles_ref.list_documents():
+                if style_doc_ref.id not in new_styles:
+                    self._bulk_delete(style_doc_ref)
             
-            batch.commit()
+            # 不使用 merge，避免位置ID對應到不同風格時殘留舊欄位
+            for style_id, style_data in new_styles.items():
+                self._bulk_set(styles_ref.document(style_id), style_data)
             
         except Exception as e:
             logger.error(f"同步卡片 {card_id} 風格變體失敗: {e}")
@@ -697,6 +892,7 @@ class ShadowverseFirebaseSync:
             'success_rate': (self.stats['successful_cards'] / max(self.stats['total_cards'], 1)) * 100,
             'inserted': self.stats['inserted'],
             'updated': self.stats['updated'],
+            'unchanged': self.stats['unchanged'],
             'errors': self.stats['errors'][:10]  # 只顯示前 10 個錯誤
         }
 
@@ -719,8 +915,7 @@ def sync_tips_data(config: FirebaseConfig, data_directory: str = 'output/tips_da
             continue
         
         try:
-            with open(tips_file, 'r', encoding='utf-8') as f:
-                tips_data = json.load(f)
+            tips_data = load_json_file(tips_file)
             
             # 記錄同步前的統計數據
             before_inserted = sync.stats['inserted']
@@ -747,9 +942,6 @@ def sync_tips_data(config: FirebaseConfig, data_directory: str = 'output/tips_da
         except Exception as e:
             logger.error(f"{language} Tips同步失敗: {e}")
             sync_results[language] = {'success': False, 'error': str(e)}
-        
-        # 語言間稍作休息
-        time.sleep(1)
     
     return sync_results
 
@@ -760,6 +952,13 @@ def sync_all_languages(config: FirebaseConfig, data_directory: str = 'output') -
     
     logger.info("開始同步所有語言的卡牌資料到 Firebase...")
     
+    # 所有語言共用同一個同步器與 Firestore 用戶端；
+    # 第一個語言寫入共通欄位後，其餘語言只寫入語言相關欄位
+    sync = ShadowverseFirebaseSync(config)
+    # 各語言的卡包、種族、技能名稱先合併，最後每個文件只寫入一次
+    reference_names = {}
+    
+    json_files = []
     for language in languages:
         json_file = os.path.join(data_directory, f'shadowverse_cards_{language}.json')
         
@@ -768,18 +967,34 @@ def sync_all_languages(config: FirebaseConfig, data_directory: str = 'output') -
             sync_results[language] = {'success': False, 'error': 'File not found'}
             continue
         
-        sync = ShadowverseFirebaseSync(config)
-        success = sync.sync_language_data(language, json_file)
-        
-        sync_results[language] = {
-            'success': success,
-            'statistics': sync.get_sync_statistics()
-        }
-        
-        logger.info(f"{language} 同步結果: {'成功' if success else '失敗'}")
-        
-        # 語言間稍作休息
-        time.sleep(2)
+        json_files.append((language, json_file))
+    
+    # 語言之間共用已寫入共通欄位的卡片集合與同一份統計，因此仍依序同步；
+    # 同步目前語言時，在背景執行緒預先讀取下一個語言的檔案 (讀檔時會釋放 GIL)；
+    # 解析仍在同步開始時進行，避免解析佔用 GIL 拖慢正在同步的語言
+    with concurrent.futures.ThreadPoolExecutor(max_workers=1) as loader:
+        next_data = loader.submit(read_file_bytes, json_files[0][1]) if json_files else None
+        
+        for i, (language, json_file) in enumerate(json_files):
+            preloaded = next_data
+            if i + 1 < len(json_files):
+                next_data = loader.submit(read_file_bytes, json_files[i + 1][1])
+            
+            sync.reset_stats()
+            success = sync.sync_language_data(language, json_file, reference_names, preloaded)
+            
+            sync_results[language] = {
+                'success': success,
+                'statistics': sync.get_sync_statistics()
+            }
+            
+            logger.info(f"{language} 同步結果: {'成功' if success else '失敗'}")
+    
+    if reference_names:
+        try:
+            sync.sync_reference_names(reference_names)
+        except Exception as e:
+            logger.error(f"同步參考資料失敗: {e}")
     
     return sync_results
 
@@ -788,18 +1003,21 @@ def load_config() -> FirebaseConfig:
     config_file = 'firebase/config.json'
     
     if os.path.exists(config_file):
-        with open(config_file, 'r', encoding='utf-8') as f:
-            config_data = json.load(f)
+        config_data = load_json_file(config_file)
         
         return FirebaseConfig(
             project_id=config_data['project_id'],
-            service_account_key_path=config_data['service_account_key_path']
+            service_account_key_path=config_data['service_account_key_path'],
+            sync_batch_size=config_data.get('sync_batch_size'),
+            sync_max_workers=config_data.get('sync_max_workers')
         )
     else:
         # 從環境變數載入
         return FirebaseConfig(
             project_id=os.getenv('FIREBASE_PROJECT_ID', ''),
-            service_account_key_path=os.getenv('FIREBASE_SERVICE_ACCOUNT_KEY', '')
+            # 與 firebase/init_firebase.py 相同：FIREBASE_SERVICE_ACCOUNT_KEY_PATH 優先，也接受 FIREBASE_SERVICE_ACCOUNT_KEY
+            service_account_key_path=(os.getenv('FIREBASE_SERVICE_ACCOUNT_KEY_PATH')
+                                      or os.getenv('FIREBASE_SERVICE_ACCOUNT_KEY', ''))
         )
 
 def main():
@@ -847,6 +1065,7 @@ def main():
                     stats = result['statistics']
                     print(f"  - 插入: {stats.get('inserted', 0)}")
                     print(f"  - 更新: {stats.get('updated', 0)}")
+                    print(f"  - 未變更: {stats.get('unchanged', 0)}")
                     print(f"  - 成功率: {stats.get('success_rate', 0):.1f}%")
                 elif not result['success']:
                     print(f"  - 錯誤: {result.get('error', '未知錯誤')}")
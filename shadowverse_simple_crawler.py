@@ -5,12 +5,23 @@ Shadowverse 卡牌資料爬蟲腳本（簡化版）
 使用 requests 爬取 shadowverse-wb.com 的卡牌資料並整理成 JSON 格式
 """
 
+import asyncio
 import json
 import time
 import logging
 import requests
 from typing import Dict, List, Any, Optional
 
+try:
+    import aiohttp
+except ImportError:  # 僅非同步擷取（fetch_card_data_async）需要
+    aiohttp = None
+
+try:
+    import orjson
+except ImportError:  # 未安裝時退回標準函式庫 json
+    orjson = None
+
 # 設定日誌和目錄
 import os
 os.makedirs('logs', exist_ok=True)
@@ -70,18 +81,22 @@ class ShadowverseSimpleCrawler:
             }
         }
     
+    def _build_params(self, offset: int) -> Dict[str, Any]:
+        """構建卡牌列表 API 的查詢參數"""
+        return {
+            'offset': offset,
+            'class': '0,1,2,3,4,5,6,7',
+            'cost': '0,1,2,3,4,5,6,7,8,9,10',
+            'lang': self.lang
+        }
+    
     def fetch_card_data(self, offset: int = 0) -> Optional[Dict[str, Any]]:
         """獲取指定 offset 的卡牌資料"""
         try:
             logger.info(f"正在獲取 {self.lang} 語言 offset={offset} 的資料...")
             
             # 構建參數
-            params = {
-                'offset': offset,
-                'class': '0,1,2,3,4,5,6,7',
-                'cost': '0,1,2,3,4,5,6,7,8,9,10',
-                'lang': self.lang
-            }
+            params = self._build_params(offset)
             
             response = self.session.get(self.base_url, params=params, timeout=30)
             
@@ -106,6 +121,38 @@ class ShadowverseSimpleCrawler:
             logger.error(f"請求 offset={offset} 時發生錯誤: {e}")
             return None
     
+    async def fetch_card_data_async(self, session: "aiohttp.ClientSession", offset: int = 0) -> Optional[Dict[str, Any]]:
+        """fetch_card_data 的非同步版本，使用呼叫端提供的共用 aiohttp.ClientSession"""
+        # 沿用同步 session 的標頭；aiohttp 預設不支援 br 解壓縮，因此只要求 gzip/deflate
+        headers = dict(self.session.headers)
+        headers['Accept-Encoding'] = 'gzip, deflate'
+        
+        try:
+            logger.info(f"正在獲取 {self.lang} 語言 offset={offset} 的資料...")
+            
+            async with session.get(self.base_url, params=self._build_params(offset), headers=headers,
+                                   timeout=aiohttp.ClientTimeout(total=30)) as response:
+                # 檢查狀態碼
+                if response.status == 200:
+                    try:
+                        data = await response.json(content_type=None)
+                        card_count = len(data.get('data', {}).get('card_details', {}))
+                        logger.info(f"成功獲取 {self.lang} 語言 offset={offset} 的資料，包含 {card_count} 張卡片")
+                        return data
+                    except json.JSONDecodeError:
+                        logger.warning(f"offset={offset} 回應不是有效的 JSON")
+                        return None
+                else:
+                    logger.warning(f"offset={offset} HTTP 狀態碼: {response.status}")
+                    return None
+                    
+        except asyncio.TimeoutError:
+            logger.error(f"請求 offset={offset} 超時")
+            return None
+        except aiohttp.ClientError as e:
+            logger.error(f"請求 offset={offset} 時發生錯誤: {e}")
+            return None
+    
     def merge_data(self, new_data: Dict[str, Any]) -> None:
         """合併新資料到完整資料集中"""
         if not new_data or 'data' not in new_data:
@@ -205,8 +252,13 @@ class ShadowverseSimpleCrawler:
     def save_to_file(self, filename: str = "shadowverse_cards.json") -> None:
         """將資料儲存到檔案"""
         try:
-            with open(filename, 'w', encoding='utf-8') as f:
-                json.dump(self.complete_data, f, ensure_ascii=False, indent=2)
+            if orjson is not None:
+                # orjson 一次序列化成 UTF-8 bytes，輸出格式與 json.dump(indent=2) 相同
+                with open(filename, 'wb') as f:
+                    f.write(orjson.dumps(self.complete_data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+            else:
+                with open(filename, 'w', encoding='utf-8') as f:
+                    json.dump(self.complete_data, f, ensure_ascii=False, indent=2)
             logger.info(f"資料已儲存到 {filename}")
             
             # 顯示檔案大小
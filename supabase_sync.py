@@ -40,8 +40,8 @@ class ShadowverseDataSync:
             sys.exit(1)
         
         try:
-            with open(config_path, 'r', encoding='utf-8') as f:
-                config = json.load(f)
+            with open(config_path, 'rb') as f:
+                config = json.loads(f.read())
             
             required_keys = ['supabase_url', 'supabase_key']
             for key in required_keys:
@@ -64,6 +64,14 @@ class ShadowverseDataSync:
         """獲取指定 schema 的表引用"""
         return self.supabase.schema(self.schema_name).table(table_name)
 
+    def _count_rows(self, table_name: str, column: str, language: Optional[str] = None) -> int:
+        """只取回筆數（HEAD + count=exact），不傳輸任何資料列"""
+        query = self._get_table(table_name).select(column, count='exact', head=True)
+        if language is not None:
+            query = query.eq('language', language)
+        result = query.execute()
+        return result.count or 0
+
     def _check_permissions(self):
         """檢查資料庫權限"""
         try:
@@ -544,24 +552,16 @@ class ShadowverseDataSync:
 
             for lang in languages:
                 # 卡片數量（從i18n表查詢）
-                cards_result = self._get_table('card_i18n').select('card_id').eq('language', lang).execute()
-                cards_count = len(cards_result.data) if cards_result.data else 0
+                cards_count = self._count_rows('card_i18n', 'card_id', lang)
                 total_cards += cards_count
 
                 # 其他依語言的資料
-                texts_result = self._get_table('card_texts').select('id').eq('language', lang).execute()
-                tips_result = self._get_table('tips').select('id').eq('language', lang).execute()
-                card_sets_result = self._get_table('card_set_i18n').select('card_set_id').eq('language', lang).execute()
-                tribes_result = self._get_table('tribe_i18n').select('tribe_id').eq('language', lang).execute()
-                skills_result = self._get_table('skill_i18n').select('skill_id').eq('language', lang).execute()
-                questions_result = self._get_table('card_questions').select('id').eq('language', lang).execute()
-
-                texts_count = len(texts_result.data) if texts_result.data else 0
-                tips_count = len(tips_result.data) if tips_result.data else 0
-                card_sets_count = len(card_sets_result.data) if card_sets_result.data else 0
-                tribes_count = len(tribes_result.data) if tribes_result.data else 0
-                skills_count = len(skills_result.data) if skills_result.data else 0
-                questions_count = len(questions_result.data) if questions_result.data else 0
+                texts_count = self._count_rows('card_texts', 'id', lang)
+                tips_count = self._count_rows('tips', 'id', lang)
+                card_sets_count = self._count_rows('card_set_i18n', 'card_set_id', lang)
+                tribes_count = self._count_rows('tribe_i18n', 'tribe_id', lang)
+                skills_count = self._count_rows('skill_i18n', 'skill_id', lang)
+                questions_count = self._count_rows('card_questions', 'id', lang)
 
                 print(f"{lang.upper()} - 卡片: {cards_count}, 卡片文字: {texts_count}, 提示: {tips_count}")
                 print(f"        卡組: {card_sets_count}, 部族: {tribes_count}, 技能: {skills_count}, 問答: {questions_count}")
@@ -569,26 +569,17 @@ class ShadowverseDataSync:
             print(f"總卡片數: {total_cards}")
 
             # 檢查基礎表資料
-            base_cards_result = self._get_table('card_bases').select('card_id').execute()
-            base_card_sets_result = self._get_table('card_set_bases').select('id').execute()
-            base_tribes_result = self._get_table('tribe_bases').select('id').execute()
-            base_skills_result = self._get_table('skill_bases').select('id').execute()
-
-            base_cards_count = len(base_cards_result.data) if base_cards_result.data else 0
-            base_card_sets_count = len(base_card_sets_result.data) if base_card_sets_result.data else 0
-            base_tribes_count = len(base_tribes_result.data) if base_tribes_result.data else 0
-            base_skills_count = len(base_skills_result.data) if base_skills_result.data else 0
+            base_cards_count = self._count_rows('card_bases', 'card_id')
+            base_card_sets_count = self._count_rows('card_set_bases', 'id')
+            base_tribes_count = self._count_rows('tribe_bases', 'id')
+            base_skills_count = self._count_rows('skill_bases', 'id')
 
             print(f"基礎表 - 卡片: {base_cards_count}, 卡組: {base_card_sets_count}, 部族: {base_tribes_count}, 技能: {base_skills_count}")
 
             # 檢查關係資料
-            tribes_relations_result = self._get_table('card_tribes').select('id').execute()
-            card_relations_result = self._get_table('card_relations').select('id').execute()
-            questions_result = self._get_table('card_questions').select('id').execute()
-
-            tribes_relations_count = len(tribes_relations_result.data) if tribes_relations_result.data else 0
-            card_relations_count = len(card_relations_result.data) if card_relations_result.data else 0
-            questions_count = len(questions_result.data) if questions_result.data else 0
+            tribes_relations_count = self._count_rows('card_tribes', 'id')
+            card_relations_count = self._count_rows('card_relations', 'id')
+            questions_count = self._count_rows('card_questions', 'id')
 
             print(f"部族關係: {tribes_relations_count}")
             print(f"卡片關係: {card_relations_count}")
@@ -7,19 +7,24 @@ Shadowverse WB 系統Tips資料爬蟲
 
 import os
 import json
-import time
 import re
 import glob
 from pathlib import Path
 from bs4 import BeautifulSoup
 import argparse
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.chrome.service import Service
-from webdriver_manager.chrome import ChromeDriverManager
+import requests
+
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+
+# 瀏覽器備援時不需要的子資源（圖片、字型、樣式表、追蹤腳本），透過 CDP 直接封鎖
+BLOCKED_URL_PATTERNS = [
+    '*.png', '*.jpg', '*.jpeg', '*.gif', '*.webp', '*.svg',
+    '*.css', '*.woff', '*.woff2', '*.ttf',
+    '*google-analytics.com*', '*googletagmanager.com*', '*doubleclick.net*'
+]
+
+# Tips列表項目（與 parse_tips_data 使用的選擇器一致）
+TIPS_ITEM_SELECTOR = '#tips-list li, .keyword-list li, .tips-list li, .keyword-line'
 
 def parse_tips_data(html):
     """解析系統通用的tips資訊"""
@@ -50,8 +55,25 @@ def save_tips_data(tips_data, output_dir, lang_code):
         }, f, ensure_ascii=False, indent=2)
     print(f"💡 系統Tips已儲存: {tips_file}")
 
+def fetch_tips_html(sample_url):
+    """直接以 HTTP 取得頁面 HTML bytes（不啟動瀏覽器）"""
+    response = requests.get(sample_url, headers={
+        'User-Agent': USER_AGENT,
+        'Accept-Language': 'zh-TW,zh;q=0.9,en;q=0.8'
+    }, timeout=30)
+    response.raise_for_status()
+    # 回傳原始 bytes，由 BeautifulSoup 依 <meta charset> 判斷編碼；
+    # Content-Type 未帶 charset 時 requests 會把 text/html 當成 ISO-8859-1，中日韓文字會變成亂碼
+    return response.content
+
 def setup_selenium(headless=True):
     """設定Selenium WebDriver"""
+    # 僅在需要瀏覽器備援時才載入 Selenium
+    from selenium import webdriver
+    from selenium.webdriver.chrome.options import Options
+    from selenium.webdriver.chrome.service import Service
+    from webdriver_manager.chrome import ChromeDriverManager
+
     chrome_options = Options()
     if headless:
         chrome_options.add_argument('--headless=new')  # 使用新版無頭模式
@@ -61,24 +83,33 @@ def setup_selenium(headless=True):
     chrome_options.add_argument('--disable-web-security')
     chrome_options.add_argument('--window-size=1920,1080')
     chrome_options.add_argument('--lang=zh-TW')
-    chrome_options.add_argument('--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36')
+    chrome_options.add_argument(f'--user-agent={USER_AGENT}')
     # 禁用圖片載入以加速
     chrome_options.add_argument('--disable-images')
+    chrome_options.add_argument('--blink-settings=imagesEnabled=false')
+    chrome_options.add_argument('--disable-features=TranslateUI,MediaRouter')
     # 禁用擴充功能
     chrome_options.add_argument('--disable-extensions')
     
     service = Service(ChromeDriverManager().install())
     driver = webdriver.Chrome(service=service, options=chrome_options)
+    
+    # 封鎖非必要的子資源，只保留 HTML 與 JavaScript
+    driver.execute_cdp_cmd('Network.enable', {})
+    driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': BLOCKED_URL_PATTERNS})
     return driver
 
-def crawl_tips_data(lang_code, sample_url, output_dir, headless=True):
-    """爬取指定語言的系統tips資料"""
-    print(f"\n==== {lang_code} 系統Tips爬取開始 ====")
-    
+def crawl_tips_with_selenium(lang_code, sample_url, headless=True):
+    """以 Selenium 載入頁面並解析tips（頁面需要 JavaScript 渲染時的備援）"""
+    from selenium.common.exceptions import TimeoutException
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support.ui import WebDriverWait
+    from selenium.webdriver.support import expected_conditions as EC
+
     driver = setup_selenium(headless=headless)
     
     try:
-        print(f"[{lang_code}] 正在訪問: {sample_url}")
+        print(f"[{lang_code}] 正在以瀏覽器訪問: {sample_url}")
         driver.get(sample_url)
         
         # 等待主要內容載入 - 嘗試多個可能的元素
@@ -91,11 +122,33 @@ def crawl_tips_data(lang_code, sample_url, output_dir, headless=True):
             except:
                 wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, '#card-detail')))
         
-        # 額外等待JavaScript渲染
-        time.sleep(2)
+        # 等待JavaScript渲染出Tips列表，取代固定的等待時間
+        try:
+            WebDriverWait(driver, 5).until(
+                EC.presence_of_element_located((By.CSS_SELECTOR, TIPS_ITEM_SELECTOR)))
+        except TimeoutException:
+            pass
+        
+        return parse_tips_data(driver.page_source)
+    finally:
+        driver.quit()
+
+def crawl_tips_data(lang_code, sample_url, output_dir, headless=True, use_browser=True):
+    """爬取指定語言的系統tips資料"""
+    print(f"\n==== {lang_code} 系統Tips爬取開始 ====")
+    
+    try:
+        # 先以一般 HTTP 請求取得頁面，能解析出tips就不必啟動瀏覽器
+        print(f"[{lang_code}] 正在訪問: {sample_url}")
+        tips_data = []
+        try:
+            tips_data = parse_tips_data(fetch_tips_html(sample_url))
+        except requests.RequestException as e:
+            print(f"[{lang_code}] HTTP 請求失敗: {e}")
         
-        html = driver.page_source
-        tips_data = parse_tips_data(html)
+        if not tips_data and use_browser:
+            print(f"[{lang_code}] 靜態頁面中沒有Tips資料，改用瀏覽器載入")
+            tips_data = crawl_tips_with_selenium(lang_code, sample_url, headless=headless)
         
         if tips_data:
             save_tips_data(tips_data, output_dir, lang_code)
@@ -105,8 +158,6 @@ def crawl_tips_data(lang_code, sample_url, output_dir, headless=True):
             
     except Exception as e:
         print(f"[{lang_code}] 爬取失敗: {e}")
-    finally:
-        driver.quit()
     
     print(f"==== {lang_code} 系統Tips爬取完成 ====")
 
@@ -115,6 +166,7 @@ def main():
     parser.add_argument('--langs', nargs='+', help='指定語言代碼 (如 cht ja en chs ko)，預設全部')
     parser.add_argument('--output-dir', type=str, default='./output/tips_data', help='輸出資料夾')
     parser.add_argument('--no-headless', action='store_true', help='顯示瀏覽器視窗（預設為無頭模式）')
+    parser.add_argument('--no-browser', action='store_true', help='只使用 HTTP 請求，不以 Selenium 瀏覽器備援')
     args = parser.parse_args()
 
     output_dir = Path(args.output_dir)
@@ -130,7 +182,8 @@ def main():
         sample_url = f"https://shadowverse-wb.com/{lang_code}/deck/cardslist/card/?card_id=10201110"
         
         if sample_url:
-            crawl_tips_data(lang_code, sample_url, output_dir, headless=not args.no_headless)
+            crawl_tips_data(lang_code, sample_url, output_dir, headless=not args.no_headless,
+                            use_browser=not args.no_browser)
         else:
             print(f"[Error] sample_url:{sample_url} 設定錯誤")
 